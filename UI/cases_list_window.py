@@ -1,7 +1,7 @@
 # UI/cases_list_window.py
 
 import sys
-import shutil
+from collections import Counter
 from pathlib import Path
 from typing import Optional, List, Dict, Any
 
@@ -20,7 +20,7 @@ from PyQt5.QtWidgets import (
 from PyQt5.QtGui import QFont
 from PyQt5.QtCore import Qt
 
-from backend.state import AppState, default_cases_root, DOC_STATUS_SUMMARIZED, DOC_STATUS_ERROR
+from backend.state import AppState, default_cases_root, discard_dir, DOC_STATUS_SUMMARIZED, DOC_STATUS_ERROR
 from UI.ui_theme import apply_window_theme
 
 
@@ -122,7 +122,8 @@ class CasesListWindow(QWidget):
         self.cases = []
 
         for d in sorted(root.iterdir(), reverse=True):
-            if not d.is_dir():
+            # Hidden folders include cases that are still being deleted (discard_dir).
+            if not d.is_dir() or d.name.startswith("."):
                 continue
             mp = d / "manifest.json"
             if not mp.exists():
@@ -132,8 +133,9 @@ class CasesListWindow(QWidget):
                 st = AppState.load_manifest(mp)
 
                 total_docs = len(st.documents)
-                done = len([x for x in st.documents if x.status == DOC_STATUS_SUMMARIZED])
-                err = len([x for x in st.documents if x.status == DOC_STATUS_ERROR])
+                counts = Counter(x.status for x in st.documents)
+                done = counts[DOC_STATUS_SUMMARIZED]
+                err = counts[DOC_STATUS_ERROR]
 
                 created = st.case.archive_created_at or ""
                 updated = st.updated_at or ""
@@ -216,7 +218,7 @@ class CasesListWindow(QWidget):
             return
 
         try:
-            shutil.rmtree(case_dir)
+            discard_dir(case_dir)
             self.refresh_cases()
         except Exception as e:
             QMessageBox.critical(self, "Fout", f"Kan dossier niet verwijderen:\n{e}")
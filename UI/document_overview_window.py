@@ -135,27 +135,6 @@ class DocumentOverviewWindow(QWidget):
         root.addWidget(container)
         self.setLayout(root)
 
-    def _combo_style(self) -> str:
-        # QComboBox is not styled in global theme, so we style it locally.
-        return """
-            QComboBox {
-                background-color: rgb(255, 255, 255);
-                color: rgb(50, 50, 50);
-                border: 1px solid rgba(0, 0, 0, 18);
-                border-radius: 10px;
-                padding: 8px 10px;
-                font-size: 14px;
-            }
-            QComboBox:focus {
-                border: 2px solid #FFA500;
-                padding: 7px 9px;
-            }
-            QComboBox::drop-down {
-                border: none;
-                width: 34px;
-            }
-        """
-
     def load_documents(self):
         # Clear existing widgets
         while self.scroll_layout.count():
@@ -213,8 +192,8 @@ class DocumentOverviewWindow(QWidget):
 
         # Dropdown for type (stores code in userData)
         type_box = NoWheelComboBox()
+        type_box.setObjectName("input")
         type_box.setEditable(False)
-        type_box.setStyleSheet(self._combo_style())
 
         detected_code = (doc.detected_type or "UNKNOWN").strip()
         override_code = (doc.type_override or "").strip()
@@ -2,8 +2,11 @@
 
 import sys
 import shutil
+import threading
+from collections import Counter
+from concurrent.futures import Future, ThreadPoolExecutor
 from pathlib import Path
-from typing import Optional, Dict
+from typing import Optional, Dict, List
 
 from PyQt5.QtWidgets import (
     QApplication,
@@ -26,6 +29,7 @@ from PyQt5.QtCore import Qt, QDateTime, QTimer
 
 from backend.state import (
     AppState,
+    DocumentState,
     DOC_STATUS_EXTRACTED,
     DOC_STATUS_DETECTED,
     DOC_STATUS_QUEUED,
@@ -34,11 +38,23 @@ from backend.state import (
     DOC_STATUS_ERROR,
     DOC_STATUS_SKIPPED,
 )
-from backend.summarizer_worker import SummarizationWorker
+from backend.classification_cache import ClassificationCache
+from backend.summarizer_worker import SummarizationWorker, extract_text_cached
 from UI.ui_theme import apply_window_theme
 from UI.final_report_window import FinalReportWindow
 
 
+def _warm_up_llm() -> None:
+    # Imported here: the llama_cpp/ctransformers import also stays off the GUI thread.
+    from backend.summarizer import warm_up_llm
+    warm_up_llm()
+
+
+# Documents queued at the worker at once. The model runs one document at a time;
+# a second queued job means the worker never idles waiting for the UI round-trip.
+MAX_IN_FLIGHT = 2
+
+
 class DossierDocumentsWindow(QWidget):
     """
     Summaries Table:
@@ -56,9 +72,20 @@ class DossierDocumentsWindow(QWidget):
         self._center_on_screen()
 
         self.worker: Optional[SummarizationWorker] = None
-        self.current_doc_id: Optional[str] = None
+        # Documents submitted to the worker and not finished yet (submission order).
+        # They stay 'queued' until the worker reports it started them.
+        self.in_flight: List[str] = []
+
+        # Text of the next queued document is extracted while the current one summarizes.
+        self._prefetch_pool = ThreadPoolExecutor(max_workers=1)
+        self._prefetched: Dict[str, Future] = {}
+        # Texts stored during classification (same file contents) are reused, not re-extracted.
+        self._cls_cache = ClassificationCache.for_case(state.case.case_dir if state is not None else None)
 
         self.row_by_doc_id: Dict[str, int] = {}
+        self._subtitle_base = ""
+        self._last_progress_msg = ""
+        self.doc_by_id: Dict[str, DocumentState] = {}
 
         self._build_ui()
         apply_window_theme(self)
@@ -68,6 +95,11 @@ class DossierDocumentsWindow(QWidget):
 
         self.load_table()
 
+        # Load the model weights in the background while the table is shown, but only
+        # when this case still has documents to summarize (no-op before the first download).
+        if self.state is not None and any(d.status == DOC_STATUS_QUEUED for d in self.state.documents):
+            threading.Thread(target=_warm_up_llm, name="llm-warmup", daemon=True).start()
+
         # Keep auto-start, but user can always resume manually.
         QTimer.singleShot(250, self.start_auto_summarization)
 
@@ -176,6 +208,10 @@ class DossierDocumentsWindow(QWidget):
         changed = False
 
         for doc in self.state.documents:
+            # Documents still queued at the worker are not interrupted.
+            if doc.doc_id in self.in_flight:
+                continue
+
             # Ensure skipped documents stay skipped
             if not doc.selected and doc.status != DOC_STATUS_SKIPPED:
                 doc.status = DOC_STATUS_SKIPPED
@@ -229,19 +265,20 @@ class DossierDocumentsWindow(QWidget):
     # -------------------------
     def _update_subtitle(self) -> None:
         if self.state is None:
-            self.subtitle.setText("Geen case geladen.")
+            self._subtitle_base = "Geen case geladen."
+            self.subtitle.setText(self._subtitle_base)
             return
 
         total = len(self.state.documents)
-        queued = len([d for d in self.state.documents if d.status == DOC_STATUS_QUEUED])
-        running = len([d for d in self.state.documents if d.status == DOC_STATUS_SUMMARIZING])
-        done = len([d for d in self.state.documents if d.status == DOC_STATUS_SUMMARIZED])
-        err = len([d for d in self.state.documents if d.status == DOC_STATUS_ERROR])
+        counts = Counter(d.status for d in self.state.documents)
 
-        self.subtitle.setText(
+        self._subtitle_base = (
             f"Case: {self.state.case.case_id} • Documenten: {total} • "
-            f"Queued: {queued} • Running: {running} • Done: {done} • Errors: {err}"
+            f"Queued: {counts[DOC_STATUS_QUEUED]} • Running: {counts[DOC_STATUS_SUMMARIZING]} • "
+            f"Done: {counts[DOC_STATUS_SUMMARIZED]} • Errors: {counts[DOC_STATUS_ERROR]}"
         )
+        self._last_progress_msg = ""
+        self.subtitle.setText(self._subtitle_base)
 
     def load_table(self) -> None:
         if self.state is None:
@@ -249,6 +286,7 @@ class DossierDocumentsWindow(QWidget):
             return
 
         self.row_by_doc_id = {}
+        self.doc_by_id = {d.doc_id: d for d in self.state.documents}
 
         self.table.setRowCount(len(self.state.documents))
         for row, doc in enumerate(self.state.documents):
@@ -294,18 +332,31 @@ class DossierDocumentsWindow(QWidget):
         self._update_subtitle()
         self._update_progress_bar()
 
+    def _get_doc(self, doc_id: str) -> Optional[DocumentState]:
+        doc = self.doc_by_id.get(doc_id)
+        if doc is None and self.state is not None:
+            # Fallback for documents added after load_table()
+            doc = next((d for d in self.state.documents if d.doc_id == doc_id), None)
+            if doc is not None:
+                self.doc_by_id[doc_id] = doc
+        return doc
+
     def _update_progress_bar(self) -> None:
         if self.state is None:
             self.progress.setValue(0)
             return
 
-        selected = [d for d in self.state.documents if d.selected]
+        selected = done = 0
+        for d in self.state.documents:
+            if d.selected:
+                selected += 1
+                if d.status == DOC_STATUS_SUMMARIZED:
+                    done += 1
         if not selected:
             self.progress.setValue(0)
             return
 
-        done = len([d for d in selected if d.status == DOC_STATUS_SUMMARIZED])
-        pct = int((done / len(selected)) * 100)
+        pct = int((done / selected) * 100)
         self.progress.setValue(max(0, min(100, pct)))
 
     def _summary_paths_for_doc(self, doc) -> Dict[str, Path]:
@@ -321,7 +372,7 @@ class DossierDocumentsWindow(QWidget):
         if self.state is None:
             return
 
-        doc = next((d for d in self.state.documents if d.doc_id == doc_id), None)
+        doc = self._get_doc(doc_id)
         if doc is None:
             return
 
@@ -351,47 +402,83 @@ class DossierDocumentsWindow(QWidget):
         if self.state is None:
             return
 
-        # If a worker is already running, do nothing.
-        if self.worker is not None and hasattr(self.worker, "isRunning") and self.worker.isRunning():
-            return
-
-        next_doc = next((d for d in self.state.documents if d.status == DOC_STATUS_QUEUED), None)
-        if next_doc is None:
+        # Top up the worker queue to MAX_IN_FLIGHT documents
+        # (one pass over the documents, not a rescan from the start per slot).
+        queued = (d for d in self.state.documents if d.status == DOC_STATUS_QUEUED and d.doc_id not in self.in_flight)
+        while len(self.in_flight) < MAX_IN_FLIGHT:
+            next_doc = next(queued, None)
+            if next_doc is None:
+                break
+            if not self._start_summarization_for_doc(next_doc.doc_id):
+                break
+
+        if not self.in_flight:
             self._update_subtitle()
             self._update_progress_bar()
-            return
 
-        self._start_summarization_for_doc(next_doc.doc_id)
-
-    def _start_summarization_for_doc(self, doc_id: str) -> None:
+    def _start_summarization_for_doc(self, doc_id: str) -> bool:
         if self.state is None or self.state.case.summaries_dir is None or self.state.case.extracted_dir is None:
             QMessageBox.critical(self, "Fout", "Case directories are not initialized.")
-            return
+            return False
 
-        doc = next((d for d in self.state.documents if d.doc_id == doc_id), None)
+        doc = self._get_doc(doc_id)
         if doc is None:
+            return False
+
+        self.in_flight.append(doc_id)
+
+        doc_type_code = doc.final_type() or "UNKNOWN"
+
+        worker = self._ensure_worker()
+        worker.submit(
+            Path(doc.source_path),
+            doc_type=doc_type_code,
+            text=None,
+            text_future=self._prefetched.pop(doc_id, None),
+            job_id=doc_id,
+        )
+
+        self._prefetch_next_text(doc_id)
+        return True
+
+    def _prefetch_next_text(self, current_doc_id: str) -> None:
+        if self.state is None:
             return
 
-        self.current_doc_id = doc_id
-        doc.status = DOC_STATUS_SUMMARIZING
-        self.state.save_manifest()
+        next_doc = next(
+            (
+                d for d in self.state.documents
+                if d.status == DOC_STATUS_QUEUED and d.doc_id != current_doc_id and d.doc_id not in self.in_flight
+            ),
+            None,
+        )
+        if next_doc is None or next_doc.doc_id in self._prefetched:
+            return
 
-        self._set_status_in_table(doc_id, DOC_STATUS_SUMMARIZING)
-        self._update_subtitle()
+        self._prefetched[next_doc.doc_id] = self._prefetch_pool.submit(
+            extract_text_cached, Path(next_doc.source_path), self._cls_cache
+        )
 
-        doc_type_code = doc.final_type() or "UNKNOWN"
+    def _ensure_worker(self) -> SummarizationWorker:
+        """
+        Return the long-lived summarization worker, starting it if needed.
+        The same thread (and loaded model) is reused for every document in the queue.
+        """
+        if self.worker is not None and self.worker.isRunning():
+            return self.worker
 
         self.worker = SummarizationWorker(
-            Path(doc.source_path),
             Path(self.state.case.summaries_dir),
             Path(self.state.case.extracted_dir),
-            doc_type=doc_type_code,
-            text=None,
+            cache=self._cls_cache,
         )
         self.worker.progress.connect(self._on_worker_progress)
+        self.worker.started.connect(self._on_worker_started)
+        self.worker.failed.connect(self._on_worker_failed)
         self.worker.error.connect(self._on_worker_error)
         self.worker.finished.connect(self._on_worker_finished)
         self.worker.start()
+        return self.worker
 
     def _on_worker_progress(self, message: str) -> None:
         # Minimal live feedback for user
@@ -400,31 +487,67 @@ class DossierDocumentsWindow(QWidget):
         msg = message.strip()
         if len(msg) > 140:
             msg = msg[:140] + "..."
-        self.subtitle.setText(self.subtitle.text().split("\n")[0] + "\n" + msg)
+        # Repeated progress lines are common; skip the relayout when nothing changed.
+        if msg == self._last_progress_msg:
+            return
+        self._last_progress_msg = msg
+        self.subtitle.setText(self._subtitle_base + "\n" + msg)
 
-    def _on_worker_error(self, message: str) -> None:
-        if self.state is None or self.current_doc_id is None:
+    def _on_worker_started(self, job_id: str) -> None:
+        # Only the document the worker is on counts as running, not the ones queued behind it.
+        if self.state is None or job_id not in self.in_flight:
             return
 
-        doc = next((d for d in self.state.documents if d.doc_id == self.current_doc_id), None)
+        doc = self._get_doc(job_id)
+        if doc is None:
+            return
+
+        doc.status = DOC_STATUS_SUMMARIZING
+        self.state.save_manifest()
+
+        self._set_status_in_table(job_id, DOC_STATUS_SUMMARIZING)
+        self._update_subtitle()
+
+    def _mark_doc_error(self, doc_id: str, message: str) -> None:
+        doc = self._get_doc(doc_id)
         if doc is None:
             return
 
         doc.status = DOC_STATUS_ERROR
         doc.error_message = str(message)
+        self._set_status_in_table(doc.doc_id, DOC_STATUS_ERROR)
+
+    def _on_worker_failed(self, job_id: str, message: str) -> None:
+        if self.state is None or job_id not in self.in_flight:
+            return
+
+        self.in_flight.remove(job_id)
+        self._mark_doc_error(job_id, message)
         self.state.save_manifest()
+        self._update_subtitle()
 
-        self._set_status_in_table(doc.doc_id, DOC_STATUS_ERROR)
+        QTimer.singleShot(150, self.start_auto_summarization)
+
+    def _on_worker_error(self, message: str) -> None:
+        # The worker itself failed (e.g. model preparation) and exited: every queued job is lost.
+        if self.state is None or not self.in_flight:
+            return
+
+        for doc_id in self.in_flight:
+            self._mark_doc_error(doc_id, message)
+        self.in_flight = []
+        self.state.save_manifest()
         self._update_subtitle()
 
-        self.current_doc_id = None
         QTimer.singleShot(150, self.start_auto_summarization)
 
     def _on_worker_finished(self, result: dict) -> None:
-        if self.state is None or self.current_doc_id is None:
+        job_id = result.get("job_id", "")
+        if self.state is None or job_id not in self.in_flight:
             return
 
-        doc = next((d for d in self.state.documents if d.doc_id == self.current_doc_id), None)
+        self.in_flight.remove(job_id)
+        doc = self._get_doc(job_id)
         if doc is None:
             return
 
@@ -442,7 +565,6 @@ class DossierDocumentsWindow(QWidget):
         self._update_subtitle()
         self._update_progress_bar()
 
-        self.current_doc_id = None
         QTimer.singleShot(150, self.start_auto_summarization)
 
     def _set_status_in_table(self, doc_id: str, status: str) -> None:
@@ -459,7 +581,7 @@ class DossierDocumentsWindow(QWidget):
         if self.state is None:
             return
 
-        doc = next((d for d in self.state.documents if d.doc_id == doc_id), None)
+        doc = self._get_doc(doc_id)
         if doc is None:
             return
 
@@ -500,7 +622,7 @@ class DossierDocumentsWindow(QWidget):
         if self.state is None:
             return
 
-        doc = next((d for d in self.state.documents if d.doc_id == doc_id), None)
+        doc = self._get_doc(doc_id)
         if doc is None:
             return
 
@@ -542,6 +664,8 @@ class DossierDocumentsWindow(QWidget):
 
     def closeEvent(self, event):
         self._stop_worker()
+        self._prefetch_pool.shutdown(wait=False, cancel_futures=True)
+        self._prefetched = {}
         event.accept()
 
     def _stop_worker(self) -> None:
@@ -550,6 +674,8 @@ class DossierDocumentsWindow(QWidget):
             return
         try:
             if hasattr(t, "isRunning") and t.isRunning():
+                if hasattr(t, "stop"):
+                    t.stop()
                 if hasattr(t, "requestInterruption"):
                     t.requestInterruption()
                 if hasattr(t, "quit"):
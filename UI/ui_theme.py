@@ -1,5 +1,9 @@
 from __future__ import annotations
 
+from functools import lru_cache
+from typing import Optional
+
+from PyQt5.QtGui import QFont
 from PyQt5.QtWidgets import QApplication, QWidget
 
 
@@ -10,7 +14,20 @@ ACCENT_GOLD = "#FFA500"
 TEXT_DARK = "rgb(50, 50, 50)"
 WHITE = "rgb(255, 255, 255)"
 
+FONT_FAMILY = "Segoe UI"
+
 
+@lru_cache(maxsize=None)
+def get_font(size: int, bold: bool = False) -> QFont:
+    """
+    Shared QFont instances for the theme family.
+    Created lazily (QFont needs a QApplication) and reused across widgets;
+    setFont() copies the font, so sharing one instance is safe.
+    """
+    return QFont(FONT_FAMILY, size, QFont.Bold if bold else QFont.Normal)
+
+
+@lru_cache(maxsize=1)
 def get_app_stylesheet() -> str:
     """
     Global QSS theme for the application.
@@ -20,7 +37,7 @@ def get_app_stylesheet() -> str:
       - QLabel with objectName "title"
       - QLabel with objectName "sectionTitle"
       - QLabel with objectName "fieldLabel"
-      - QLineEdit with objectName "input"
+      - QLineEdit / QTextEdit / QComboBox with objectName "input"
       - QPushButton with objectName "primaryButton"
     """
     return f"""
@@ -79,6 +96,25 @@ def get_app_stylesheet() -> str:
             padding: 9px 11px; /* keep size stable with thicker border */
         }}
 
+        QComboBox#input {{
+            background-color: {WHITE};
+            color: {TEXT_DARK};
+            border: 1px solid rgba(0, 0, 0, 18);
+            border-radius: 10px;
+            padding: 8px 10px;
+            font-size: 14px;
+        }}
+
+        QComboBox#input:focus {{
+            border: 2px solid {ACCENT_GOLD};
+            padding: 7px 9px;
+        }}
+
+        QComboBox#input::drop-down {{
+            border: none;
+            width: 34px;
+        }}
+
         /* Buttons */
         QPushButton#primaryButton {{
             background-color: {ACCENT_GOLD};
@@ -172,26 +208,38 @@ def get_app_stylesheet() -> str:
     """
 
 
+_themed_app_id: Optional[int] = None
+
+
 def apply_app_theme(app: QApplication) -> None:
     """
     Apply the stylesheet once for the whole application.
-    Safe to call multiple times.
+    Safe to call multiple times: after the first call this is a no-op, so windows
+    do not trigger a global re-polish while they are being constructed.
     """
+    global _themed_app_id
+
     if app is None:
         return
 
-    # Avoid reapplying if already set
+    if _themed_app_id == id(app):
+        return
+
+    # Avoid reapplying if already set (the sheet string itself is built once and cached)
     current = app.styleSheet() or ""
     new_sheet = get_app_stylesheet()
 
-    if current.strip() != new_sheet.strip():
+    if current != new_sheet:
         app.setStyleSheet(new_sheet)
 
+    _themed_app_id = id(app)
+
 
 def apply_window_theme(window: QWidget) -> None:
     """
     Convenience helper: applies theme through QApplication instance.
     Call this in each window __init__ after UI is built.
+    (main() applies the theme before the first window is created, so this is normally free.)
     """
     app = QApplication.instance()
     if app is not None:
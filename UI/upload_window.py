@@ -165,6 +165,7 @@ class ModelDownloadWorker(QThread):
 
             downloaded = 0
             chunk_size = 16 * 1024 * 1024  # 16MB
+            last_pct = -1
 
             with tmp_path.open("wb") as f:
                 for chunk in r.iter_content(chunk_size=chunk_size):
@@ -176,6 +177,10 @@ class ModelDownloadWorker(QThread):
                     if total > 0:
                         pct = int((downloaded / total) * 100)
                         pct = max(0, min(100, pct))
+                        # One update per integer percent is enough for the UI.
+                        if pct == last_pct:
+                            continue
+                        last_pct = pct
                         self.progress.emit(pct, f"Downloaded {downloaded} / {total} bytes")
                     else:
                         self.progress.emit(-1, f"Downloaded {downloaded} bytes")
@@ -194,6 +199,10 @@ class ModelCheckWindow(QWidget):
 
         self.model_path = Path(MODEL_PATH)
         self.worker: Optional[ModelDownloadWorker] = None
+        self._last_dl_pct = -1
+
+        # One stat() snapshot of the model file: (size, human-readable size), or None if missing.
+        self._model_stat: Optional[tuple] = None
 
         self._build_ui()
         apply_window_theme(self)
@@ -295,13 +304,18 @@ class ModelCheckWindow(QWidget):
             return f"{num_bytes / kb:.0f} KB"
         return f"{num_bytes} B"
 
-    def _model_exists(self) -> bool:
+    def _refresh_model_stat(self) -> None:
         try:
-            return self.model_path.exists() and self.model_path.stat().st_size > 10 * 1024 * 1024
-        except Exception:
-            return False
+            size = self.model_path.stat().st_size
+            self._model_stat = (size, self._human_size(size))
+        except OSError:
+            self._model_stat = None
+
+    def _model_exists(self) -> bool:
+        return self._model_stat is not None and self._model_stat[0] > 10 * 1024 * 1024
 
     def _refresh(self) -> None:
+        self._refresh_model_stat()
         exists = self._model_exists()
 
         self.state.model.path = self.model_path
@@ -309,7 +323,7 @@ class ModelCheckWindow(QWidget):
 
         if exists:
             self.state.model.status = MODEL_STATUS_READY
-            size_str = self._human_size(self.model_path.stat().st_size)
+            size_str = self._model_stat[1]
             offline = "Ja"
             note = "Model is lokaal beschikbaar. Offline gebruik is mogelijk."
         else:
@@ -336,6 +350,11 @@ class ModelCheckWindow(QWidget):
         self.download_btn.setEnabled((not exists) and self.state.model.status != MODEL_STATUS_DOWNLOADING)
 
     def _set_progress(self, percent: int) -> None:
+        # Skip repaints when the value did not change.
+        if percent == self._last_dl_pct and self.progress.isVisible():
+            return
+        self._last_dl_pct = percent
+
         self.progress.setVisible(True)
         if percent < 0:
             self.progress.setRange(0, 0)
@@ -343,7 +362,12 @@ class ModelCheckWindow(QWidget):
             self.progress.setRange(0, 100)
             self.progress.setValue(max(0, min(100, percent)))
 
+    def _hide_progress(self) -> None:
+        self.progress.setVisible(False)
+        self._last_dl_pct = -1
+
     def _start_download(self) -> None:
+        self._refresh_model_stat()
         if self._model_exists():
             QMessageBox.information(self, "Info", "Model is al aanwezig.")
             self._refresh()
@@ -369,7 +393,7 @@ class ModelCheckWindow(QWidget):
     def _on_worker_done(self) -> None:
         self.state.model.status = MODEL_STATUS_READY
         self.log_area.append("Model download complete.")
-        self.progress.setVisible(False)
+        self._hide_progress()
         self._refresh()
         QMessageBox.information(self, "Klaar", "Model is klaar voor gebruik.")
 
@@ -377,7 +401,7 @@ class ModelCheckWindow(QWidget):
         self.state.model.status = MODEL_STATUS_ERROR
         self.state.model.error_message = error_message
         self.log_area.append(f"ERROR: {error_message}")
-        self.progress.setVisible(False)
+        self._hide_progress()
         self._refresh()
         QMessageBox.critical(self, "Fout", error_message)
 
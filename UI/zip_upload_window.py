@@ -1,10 +1,10 @@
 # UI/zip_upload_window.py
 
+import queue
 import sys
-import os
 import zipfile
 from pathlib import Path
-from typing import Optional
+from typing import List, Optional
 
 from PyQt5.QtWidgets import (
     QApplication,
@@ -20,30 +20,18 @@ from PyQt5.QtWidgets import (
     QFrame,
     QSizePolicy,
 )
-from PyQt5.QtGui import QFont
-from PyQt5.QtCore import Qt
+from PyQt5.QtCore import Qt, QFileSystemWatcher, QTimer
 
+from backend.classification_cache import ClassificationCache
 from backend.config import MODEL_PATH
+from backend.process_zip import list_zip_members
 from backend.state import AppState
-from backend.summarizer_worker import ClassificationWorker
+from backend.summarizer_worker import ClassificationWorker, ExtractionWorker
 from UI.document_overview_window import DocumentOverviewWindow
-from UI.ui_theme import apply_window_theme
+from UI.ui_theme import apply_window_theme, get_font
 
-
-def _is_macos_zip_artifact(path: Path) -> bool:
-    try:
-        if "__MACOSX" in path.parts:
-            return True
-    except Exception:
-        pass
-
-    name = path.name
-    if name == ".DS_Store":
-        return True
-    if name.startswith("._"):
-        return True
-
-    return False
+# Max files per ClassificationWorker batch.
+CLASSIFY_BATCH_SIZE = 32
 
 
 class ZipUploadWindow(QWidget):
@@ -67,15 +55,41 @@ class ZipUploadWindow(QWidget):
 
         self.selected_file: Optional[str] = None
         self.all_files = []
-        self.classified = {}
+        self.classified: List[dict] = []
         self.output_dir: Optional[Path] = None
         self.extracted_dir: Optional[Path] = None
 
+        self.extractor: Optional[ExtractionWorker] = None
         self.classifier: Optional[ClassificationWorker] = None
 
+        # Extracted paths stream from the extractor into the classifier.
+        self._file_queue: Optional["queue.Queue[Optional[Path]]"] = None
+        self._extraction_failed = False
+
+        # Classification cache of the current case (sha256 of file contents -> doc_type/text);
+        # opened once the case folder exists.
+        self._cls_cache: Optional[ClassificationCache] = None
+
+        # Log lines are buffered and appended at most ~10x per second:
+        # every QTextEdit.append() re-lays out the document.
+        self._log_buffer: List[str] = []
+        self._log_timer = QTimer(self)
+        self._log_timer.setSingleShot(True)
+        self._log_timer.setInterval(100)
+        self._log_timer.timeout.connect(self._flush_log)
+
         self._build_ui()
         apply_window_theme(self)
 
+        # Stat the model once; re-stat only when its folder changes on disk.
+        self._model_size: Optional[int] = None
+        self._model_size_str = "-"
+        self._refresh_model_stat()
+        self._model_watcher = QFileSystemWatcher(self)
+        if Path(MODEL_PATH).parent.exists():
+            self._model_watcher.addPath(str(Path(MODEL_PATH).parent))
+        self._model_watcher.directoryChanged.connect(self._on_model_dir_changed)
+
         self.update_model_status_label()
 
     def _build_ui(self):
@@ -92,14 +106,14 @@ class ZipUploadWindow(QWidget):
 
         title = QLabel("Nieuw dossier (ZIP upload)")
         title.setObjectName("title")
-        title.setFont(QFont("Segoe UI", 28, QFont.Bold))
+        title.setFont(get_font(28, bold=True))
         title.setAlignment(Qt.AlignLeft)
         title.setWordWrap(True)
         page_layout.addWidget(title)
 
         uitleg = QLabel("Kies een ZIP-bestand met dossierdocumenten:")
         uitleg.setObjectName("fieldLabel")
-        uitleg.setFont(QFont("Segoe UI", 12))
+        uitleg.setFont(get_font(12))
         uitleg.setWordWrap(True)
         page_layout.addWidget(uitleg)
 
@@ -114,7 +128,7 @@ class ZipUploadWindow(QWidget):
 
         self.file_label = QLabel("Geen bestand gekozen")
         self.file_label.setObjectName("fieldLabel")
-        self.file_label.setFont(QFont("Segoe UI", 12))
+        self.file_label.setFont(get_font(12))
         self.file_label.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Preferred)
 
         file_row.addWidget(self.choose_btn, 0, Qt.AlignLeft)
@@ -130,12 +144,12 @@ class ZipUploadWindow(QWidget):
 
         model_title = QLabel("LLM-model status")
         model_title.setObjectName("sectionTitle")
-        model_title.setFont(QFont("Segoe UI", 12, QFont.Bold))
+        model_title.setFont(get_font(12, bold=True))
         model_layout.addWidget(model_title)
 
         self.model_status_label = QLabel("")
         self.model_status_label.setObjectName("fieldLabel")
-        self.model_status_label.setFont(QFont("Segoe UI", 10))
+        self.model_status_label.setFont(get_font(10))
         self.model_status_label.setWordWrap(True)
         model_layout.addWidget(self.model_status_label)
 
@@ -144,9 +158,11 @@ class ZipUploadWindow(QWidget):
         self.log_area = QTextEdit()
         self.log_area.setObjectName("input")
         self.log_area.setReadOnly(True)
-        self.log_area.setFont(QFont("Segoe UI", 11))
+        self.log_area.setFont(get_font(11))
         self.log_area.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Expanding)
         self.log_area.setMinimumHeight(220)
+        # Keep the log bounded on very large archives (oldest lines are dropped).
+        self.log_area.document().setMaximumBlockCount(5000)
         page_layout.addWidget(self.log_area, 1)
 
         bottom_row = QHBoxLayout()
@@ -203,21 +219,27 @@ class ZipUploadWindow(QWidget):
             return f"{num_bytes / kb:.0f} KB"
         return f"{num_bytes} B"
 
-    def _model_exists(self) -> bool:
+    def _refresh_model_stat(self) -> None:
         try:
-            p = Path(MODEL_PATH)
-            return p.exists() and p.stat().st_size > 10 * 1024 * 1024
-        except Exception:
-            return False
+            self._model_size = Path(MODEL_PATH).stat().st_size
+        except OSError:
+            self._model_size = None
+        self._model_size_str = self._human_size(self._model_size) if self._model_size is not None else "-"
+
+    def _on_model_dir_changed(self, _path: str) -> None:
+        self._refresh_model_stat()
+        self.update_model_status_label()
+
+    def _model_exists(self) -> bool:
+        return self._model_size is not None and self._model_size > 10 * 1024 * 1024
 
     def update_model_status_label(self) -> None:
         p = Path(MODEL_PATH)
-        if p.exists():
-            size_str = self._human_size(p.stat().st_size)
+        size_str = self._model_size_str
+        if self._model_size is not None:
             offline = "Ja"
             note = "Model is lokaal beschikbaar. Offline gebruik is mogelijk."
         else:
-            size_str = "-"
             offline = "Nee"
             note = "Model ontbreekt. Ga terug en download het model in het Modelcontrole-scherm."
 
@@ -231,7 +253,14 @@ class ZipUploadWindow(QWidget):
         self.model_status_label.setText(text)
 
     def log(self, text: str) -> None:
-        self.log_area.append(text)
+        self._log_buffer.append(text)
+        if not self._log_timer.isActive():
+            self._log_timer.start()
+
+    def _flush_log(self) -> None:
+        if self._log_buffer:
+            self.log_area.append("\n".join(self._log_buffer))
+            self._log_buffer.clear()
 
     def _set_ui_busy(self, busy: bool) -> None:
         self.choose_btn.setEnabled(not busy)
@@ -259,8 +288,20 @@ class ZipUploadWindow(QWidget):
             )
             return
 
+        # Central directory only: an empty or broken archive fails here,
+        # before a case folder is created or anything is extracted.
+        try:
+            infos = list_zip_members(Path(self.selected_file))
+        except (OSError, zipfile.BadZipFile) as e:
+            QMessageBox.critical(self, "Fout", f"Fout bij openen van ZIP:\n{e}")
+            return
+
+        if not infos:
+            QMessageBox.warning(self, "Leeg", "ZIP-bestand bevat geen documenten.")
+            return
+
         self._set_ui_busy(True)
-        self.progress_bar.setMaximum(0)
+        self.progress_bar.setMaximum(len(infos))
         self.progress_bar.setValue(0)
 
         try:
@@ -274,6 +315,8 @@ class ZipUploadWindow(QWidget):
             if self.output_dir is None:
                 raise RuntimeError("Case summaries_dir is not initialized.")
 
+            self._cls_cache = ClassificationCache.for_case(self.state.case.case_dir)
+
             self.log(f"Case aangemaakt: {self.state.case.case_id}")
             self.log(f"Extracted dir: {self.extracted_dir}")
 
@@ -284,54 +327,74 @@ class ZipUploadWindow(QWidget):
             QMessageBox.critical(self, "Fout", f"Fout bij case-initialisatie:\n{e}")
             return
 
-        try:
-            with zipfile.ZipFile(self.selected_file, "r") as zip_ref:
-                zip_ref.extractall(self.extracted_dir)
-                self.log(f"ZIP uitgepakt naar: {self.extracted_dir}")
-
-            self.all_files = []
-            for root, _, files in os.walk(self.extracted_dir):
-                root_path = Path(root)
-                if "__MACOSX" in root_path.parts:
-                    continue
-
-                for filename in files:
-                    full_path = root_path / filename
-                    if _is_macos_zip_artifact(full_path):
-                        continue
-                    self.all_files.append(full_path)
+        # Extraction runs in a QThread; each extracted file is queued for the classifier,
+        # which runs concurrently instead of waiting for the whole archive.
+        self._extraction_failed = False
+        self._file_queue = queue.Queue()
 
-            if not self.all_files:
-                self._set_ui_busy(False)
-                self.progress_bar.setMaximum(100)
-                self.progress_bar.setValue(0)
-                QMessageBox.warning(self, "Leeg", "ZIP-bestand bevat geen documenten.")
-                return
+        self.extractor = ExtractionWorker(
+            Path(self.selected_file), self.extracted_dir, out_queue=self._file_queue, infos=infos
+        )
+        self.extractor.progress.connect(self.log)
+        self.extractor.total.connect(self.on_extraction_total)
+        self.extractor.error.connect(self.on_extraction_error)
+        self.extractor.finished.connect(self.on_extraction_finished)
+        self.extractor.start()
+
+        self.start_classification(source=self._file_queue)
+
+    def on_extraction_total(self, total: int) -> None:
+        # Entry count is known from the central directory: progress becomes determinate.
+        if total > 0:
+            self.progress_bar.setMaximum(total)
+            self.progress_bar.setValue(0)
 
-            self.start_classification()
+    def on_extraction_error(self, message: str) -> None:
+        self._extraction_failed = True
+        if self.classifier is not None:
+            self.classifier.requestInterruption()
 
-        except Exception as e:
-            self._set_ui_busy(False)
-            self.progress_bar.setMaximum(100)
-            self.progress_bar.setValue(0)
-            QMessageBox.critical(self, "Fout", f"Fout bij uitpakken van ZIP:\n{e}")
+        self._set_ui_busy(False)
+        self.progress_bar.setMaximum(100)
+        self.progress_bar.setValue(0)
+        QMessageBox.critical(self, "Fout", f"Fout bij uitpakken van ZIP:\n{message}")
 
-    def start_classification(self) -> None:
+    def on_extraction_finished(self, files: list) -> None:
+        self.all_files = files
+        self.log(f"ZIP uitgepakt naar: {self.extracted_dir}")
+
+    def start_classification(self, source: Optional["queue.Queue[Optional[Path]]"] = None) -> None:
+        """
+        Classify self.all_files, or the paths arriving on `source` while extraction runs.
+        """
         self.log("Detecting document types for all files...")
 
-        self.progress_bar.setMaximum(0)
-        self.progress_bar.setValue(0)
+        if source is None:
+            self.progress_bar.setMaximum(max(1, len(self.all_files)))
+            self.progress_bar.setValue(0)
 
-        self.classified = {}
-        self.classifier = ClassificationWorker(self.all_files)
+        self.classified = []
+        # Larger batches mean fewer rule loads and log updates; the streaming case
+        # takes whatever has been extracted so far, up to the same limit.
+        batch_size = CLASSIFY_BATCH_SIZE if source is not None else max(1, min(CLASSIFY_BATCH_SIZE, len(self.all_files)))
+        # Streaming: the queue is the only input (self.all_files may hold a previous run's files).
+        self.classifier = ClassificationWorker(
+            [] if source is not None else self.all_files, source=source, cache=self._cls_cache, batch_size=batch_size
+        )
         self.classifier.progress.connect(self.log)
+        self.classifier.file_done.connect(self.progress_bar.setValue)
         self.classifier.error.connect(self.log)
         self.classifier.finished.connect(self.on_classification_finished)
         self.classifier.start()
 
     def on_classification_finished(self, results: list) -> None:
+        if self._extraction_failed:
+            # Already reported by on_extraction_error.
+            return
+
         try:
-            self.classified = {item["path"]: item for item in results}
+            # Results arrive in archive order and are used as-is (aligned with all_files).
+            self.classified = results
             self.all_files = [Path(item["path"]) for item in results]
 
             if not self.all_files:
@@ -341,20 +404,21 @@ class ZipUploadWindow(QWidget):
                 QMessageBox.warning(self, "Leeg", "Geen documenten met tekst gevonden na classificatie.")
                 return
 
-            self.log("\nDetected document types:")
-            for item in results:
-                self.log(f" • {item.get('filename', Path(item['path']).name)}  →  {item.get('doc_type', '')}")
-
+            lines = ["\nDetected document types:"]
             self.state.documents = []
-            for item in results:
+            for path, item in zip(self.all_files, results):
+                name = item.get("filename", path.name)
+                lines.append(f" • {name}  →  {item.get('doc_type', '')}")
                 self.state.add_document(
-                    original_name=item.get("filename", Path(item["path"]).name),
-                    source_path=Path(item["path"]),
+                    original_name=name,
+                    source_path=path,
                     detected_type=item.get("doc_type", "") or "",
                     detected_confidence=item.get("confidence"),
                     selected=True,
                 )
 
+            self.log("\n".join(lines))
+
             mp = self.state.save_manifest()
             self.log(f"\n✅ Classification saved: {mp}")
 
@@ -384,19 +448,23 @@ class ZipUploadWindow(QWidget):
         event.accept()
 
     def _stop_threads(self) -> None:
-        t = self.classifier
-        if t is None:
-            return
-        try:
-            if hasattr(t, "isRunning") and t.isRunning():
-                if hasattr(t, "requestInterruption"):
-                    t.requestInterruption()
-                if hasattr(t, "quit"):
-                    t.quit()
-                if hasattr(t, "wait"):
-                    t.wait(3000)
-        except Exception:
-            pass
+        # Unblock a classifier that is still waiting for extracted files.
+        if self._file_queue is not None:
+            self._file_queue.put(None)
+
+        for t in (self.extractor, self.classifier):
+            if t is None:
+                continue
+            try:
+                if hasattr(t, "isRunning") and t.isRunning():
+                    if hasattr(t, "requestInterruption"):
+                        t.requestInterruption()
+                    if hasattr(t, "quit"):
+                        t.quit()
+                    if hasattr(t, "wait"):
+                        t.wait(3000)
+            except Exception:
+                pass
 
     def _center_on_screen(self):
         screen = QApplication.primaryScreen()
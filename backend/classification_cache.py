@@ -0,0 +1,198 @@
+# backend/classification_cache.py
+
+from __future__ import annotations
+
+import hashlib
+import mmap
+import sqlite3
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional
+
+from backend.classifiers import rules_fingerprint
+from backend.config import CLASSIFICATION_CACHE_FILENAME, LEGACY_CLASSIFICATION_CACHE_PATH
+from backend.text_extraction import EXTRACTOR_VERSION
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS classification (
+    hash       TEXT PRIMARY KEY,
+    version    TEXT NOT NULL,
+    filename   TEXT NOT NULL,
+    doc_type   TEXT NOT NULL,
+    confidence REAL,
+    text       TEXT NOT NULL,
+    stored_at  REAL NOT NULL
+)
+"""
+
+
+def cache_version() -> str:
+    """
+    Extractor + classifier/rules fingerprint; entries stored under another one are ignored.
+    """
+    return f"{EXTRACTOR_VERSION}|{rules_fingerprint()}"
+
+
+def remove_legacy_cache() -> None:
+    """
+    Delete the old app-wide cache (it held document texts outside any case folder).
+    """
+    for suffix in ("", "-journal", "-wal", "-shm"):
+        try:
+            Path(str(LEGACY_CLASSIFICATION_CACHE_PATH) + suffix).unlink()
+        except OSError:
+            pass
+
+
+def file_sha256(path: Path) -> str:
+    """
+    SHA-256 of the file contents.
+    Uses mmap so the file is hashed without copying it into Python memory.
+    """
+    with open(path, "rb") as f:
+        try:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                return hashlib.sha256(mm).hexdigest()
+        except ValueError:
+            # Empty files cannot be mmapped.
+            return hashlib.sha256(b"").hexdigest()
+
+
+class ClassificationCache:
+    """
+    Persistent cache of classification results, keyed by SHA-256 of the file contents.
+    Stored in a small SQLite database (one row per hash) inside the case folder,
+    so it is deleted together with the case (see for_case()).
+    Rows carry cache_version(): after extractor, classifier or rules changes they miss.
+
+    Entry format:
+      {"filename": "...", "doc_type": "PV", "confidence": None, "text": "..."}
+
+    The filename is part of the entry because classify_document() also looks at the
+    filename; an entry only counts as a hit when both contents and filename match.
+
+    Lookups are read-only queries; new results are buffered by put() and written
+    with a single executemany() in save(). Each call opens its own short-lived
+    connection, so the cache can be created on the UI thread and used in a worker.
+    """
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        # Rows already read this session (hash -> entry); avoids repeated queries.
+        self._memo: Dict[str, Dict] = {}
+        self._pending: Dict[str, Dict] = {}
+
+    @classmethod
+    def for_case(cls, case_dir: Optional[Path]) -> Optional["ClassificationCache"]:
+        """
+        The cache of one case (None without a case folder).
+        """
+        if case_dir is None:
+            return None
+        return cls.load(Path(case_dir) / CLASSIFICATION_CACHE_FILENAME)
+
+    @classmethod
+    def load(cls, path: Path) -> "ClassificationCache":
+        cache = cls(path)
+        try:
+            with cache._connect() as conn:
+                conn.execute(_SCHEMA)
+        except Exception:
+            # A broken cache is never fatal; lookups simply miss.
+            pass
+        return cache
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(str(self.path), timeout=5)
+        try:
+            with conn:  # commit on success, rollback on error
+                yield conn
+        finally:
+            conn.close()
+
+    def get_many(self, shas: Iterable[str]) -> Dict[str, Dict]:
+        """
+        Return {hash: entry} for all known hashes, with one query for the unknown ones.
+        """
+        version = cache_version()
+        found: Dict[str, Dict] = {}
+        missing: List[str] = []
+        for sha in dict.fromkeys(shas):
+            entry = self._pending.get(sha) or self._memo.get(sha)
+            if entry is not None and entry.get("version") == version:
+                found[sha] = entry
+            else:
+                missing.append(sha)
+
+        if not missing:
+            return found
+
+        try:
+            with self._connect() as conn:
+                # Stay below SQLite's host parameter limit.
+                for start in range(0, len(missing), 500):
+                    chunk = missing[start : start + 500]
+                    marks = ",".join("?" * len(chunk))
+                    rows = conn.execute(
+                        "SELECT hash, filename, doc_type, confidence, text FROM classification "
+                        f"WHERE version = ? AND hash IN ({marks})",
+                        [version, *chunk],
+                    ).fetchall()
+                    for sha, filename, doc_type, confidence, text in rows:
+                        entry = {
+                            "version": version,
+                            "filename": filename,
+                            "doc_type": doc_type,
+                            "confidence": confidence,
+                            "text": text,
+                        }
+                        self._memo[sha] = entry
+                        found[sha] = entry
+        except Exception:
+            pass
+
+        return found
+
+    def get(self, sha: str, filename: str) -> Optional[Dict]:
+        entry = self.get_many([sha]).get(sha)
+        if entry is None or entry.get("filename") != filename:
+            return None
+        return entry
+
+    def put(self, sha: str, filename: str, doc_type: str, text: str, confidence: Optional[float] = None) -> None:
+        self._pending[sha] = {
+            "version": cache_version(),
+            "filename": filename,
+            "doc_type": doc_type,
+            "confidence": confidence,
+            "text": text,
+        }
+
+    def save(self) -> None:
+        if not self._pending:
+            return
+
+        now = time.time()
+        rows = [
+            (sha, e["version"], e["filename"], e["doc_type"], e.get("confidence"), e["text"], now)
+            for sha, e in self._pending.items()
+        ]
+
+        try:
+            with self._connect() as conn:
+                conn.execute(_SCHEMA)
+                conn.executemany(
+                    "INSERT OR REPLACE INTO classification "
+                    "(hash, version, filename, doc_type, confidence, text, stored_at) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    rows,
+                )
+                # Rows of an older extractor/classifier can never hit again.
+                conn.execute("DELETE FROM classification WHERE version != ?", (cache_version(),))
+            self._memo.update(self._pending)
+            self._pending.clear()
+        except Exception:
+            # Best-effort; losing the cache only costs a re-classification.
+            pass
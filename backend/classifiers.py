@@ -5,8 +5,53 @@ from __future__ import annotations
 import json
 import re
 import unicodedata
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, FrozenSet, List, Optional, Sequence, Tuple
+
+try:
+    # Optional accelerator: Aho-Corasick automaton, all keywords in one linear pass.
+    # Without it _RuleMatcher uses two combined `re` patterns (same results).
+    import ahocorasick as _ahocorasick
+except ImportError:
+    _ahocorasick = None
+
+# Content is matched in two tiers: first only the head of the document (cheap), then
+# the full window unless the head hit is unbeatable (_RuleMatcher.is_final()), so the
+# result is always the same as scanning the full window straight away.
+CONTENT_FAST_CHARS = 2000
+CONTENT_FULL_CHARS = 8000
+
+# Bump when classification logic changes (cached doc types carry it, see rules_fingerprint()).
+CLASSIFIER_VERSION = 2
+
+# Characters that may not touch a token (boundary check in _RuleMatcher).
+_TOKEN_CHARS = frozenset("abcdefghijklmnopqrstuvwxyz0123456789")
+
+_SEP_TABLE = str.maketrans("_-.", "   ")
+_WS_RE = re.compile(r"\s+")
+
+
+class _AccentTable(dict):
+    """
+    str.translate() table: code point -> NFKD form without combining marks.
+    Filled on first sight of each character, so every character is decomposed once
+    per process instead of once per occurrence.
+    """
+
+    def __missing__(self, code: int):
+        ch = chr(code)
+        out = "".join(c for c in unicodedata.normalize("NFKD", ch) if not unicodedata.combining(c))
+        value = code if out == ch else out
+        self[code] = value
+        return value
+
+
+_ACCENT_TABLE = _AccentTable()
+# Pre-fill the accented letters common in Dutch/European text.
+for _ch in "àáâãäåèéêëìíîïòóôõöùúûüýÿçñ":
+    _ACCENT_TABLE[ord(_ch)]
+del _ch
 
 
 def _normalize(s: str) -> str:
@@ -14,9 +59,9 @@ def _normalize(s: str) -> str:
     Lowercase + strip accents (e.g. justitiële -> justitiele).
     """
     s = (s or "").lower()
-    s = unicodedata.normalize("NFKD", s)
-    s = "".join(ch for ch in s if not unicodedata.combining(ch))
-    return s
+    if s.isascii():
+        return s
+    return s.translate(_ACCENT_TABLE)
 
 
 def _prep_for_search(s: str) -> str:
@@ -25,19 +70,28 @@ def _prep_for_search(s: str) -> str:
       - "pv_vgl", "pv-vgl", "pv.vgl" become searchable
       - "vord.ibs" becomes "vord ibs"
     """
-    s = _normalize(s)
-    s = re.sub(r"[_\-.]+", " ", s)
-    s = re.sub(r"\s+", " ", s).strip()
-    return s
+    return _squash_ws(_fold(s))
 
 
-def _token_match(haystack: str, token: str) -> bool:
+@lru_cache(maxsize=4096)
+def _prep_keyword(s: str) -> str:
     """
-    Match abbreviations as standalone tokens:
-      pv, vc, vgc, pj, ujd, tll, recl, ibs, ...
+    _prep_for_search() for rule keywords. They are a small fixed set, so the prepared
+    forms are cached across matcher rebuilds; document text stays uncached.
     """
-    token = re.escape(token)
-    return re.search(rf"(?<![a-z0-9]){token}(?![a-z0-9])", haystack) is not None
+    return _prep_for_search(s)
+
+
+def _fold(s: str) -> str:
+    # Character-wise part of _prep_for_search(): _fold(a + b) == _fold(a) + _fold(b).
+    return _normalize(s).translate(_SEP_TABLE)
+
+
+def _squash_ws(s: str) -> str:
+    # Only runs of spaces or other whitespace (all non-printable, except " ") need the regex.
+    if "  " in s or not s.isprintable():
+        s = _WS_RE.sub(" ", s)
+    return s.strip()
 
 
 def _dedupe_keep_order(items: List[str]) -> List[str]:
@@ -53,7 +107,8 @@ def _dedupe_keep_order(items: List[str]) -> List[str]:
     return out
 
 
-def _get_allowed_types_from_config() -> List[str]:
+@lru_cache(maxsize=1)
+def _get_allowed_types_from_config() -> Tuple[str, ...]:
     """
     Allowed types are driven by PROMPT_FILES keys (project truth).
     UNKNOWN is always allowed as fallback but not used as a detection target.
@@ -61,13 +116,13 @@ def _get_allowed_types_from_config() -> List[str]:
     try:
         from backend.config import PROMPT_FILES  # local import to avoid import-time issues
         keys = [k for k in PROMPT_FILES.keys() if k and k.upper() != "UNKNOWN"]
-        keys = sorted(set(k.upper() for k in keys))
-        return keys
+        return tuple(sorted(set(k.upper() for k in keys)))
     except Exception:
         # Fallback if config cannot be imported for some reason
-        return ["PJ", "VC", "PV", "RECLASS", "UJD", "TLL"]
+        return ("PJ", "VC", "PV", "RECLASS", "UJD", "TLL")
 
 
+@lru_cache(maxsize=1)
 def _default_rules() -> Dict[str, Dict[str, List[str]]]:
     """
     Default keyword rules based on the client's nomenclature screenshots (previous chat),
@@ -160,6 +215,27 @@ def _default_rules() -> Dict[str, Dict[str, List[str]]]:
     }
 
 
+_RULES_PATH = Path(__file__).resolve().parent / "nomenclature_rules.json"
+
+# (st_mtime_ns, parsed rules) of the last read of _RULES_PATH.
+_EXTERNAL_RULES_CACHE: Optional[Tuple[int, Dict[str, Dict[str, List[str]]]]] = None
+
+
+def _rules_file_mtime() -> Optional[int]:
+    try:
+        return _RULES_PATH.stat().st_mtime_ns
+    except OSError:
+        return None
+
+
+def rules_fingerprint() -> str:
+    """
+    Identifies the classifier logic plus the current rules file; a cached doc type
+    is only valid for the fingerprint it was computed with.
+    """
+    return f"{CLASSIFIER_VERSION}/{_rules_file_mtime()}"
+
+
 def _load_external_rules_json() -> Dict[str, Dict[str, List[str]]]:
     """
     Optional external rules file:
@@ -170,13 +246,25 @@ def _load_external_rules_json() -> Dict[str, Dict[str, List[str]]]:
       "PV": {"phrases": ["..."], "tokens": ["pv"]},
       "VC": {"phrases": ["..."], "tokens": ["vc", "vgc"]}
     }
+
+    Parsed once per modification time (one stat() per call otherwise).
     """
-    rules_path = Path(__file__).resolve().parent / "nomenclature_rules.json"
-    if not rules_path.exists():
+    global _EXTERNAL_RULES_CACHE
+
+    mtime = _rules_file_mtime()
+    if mtime is None:
         return {}
+    if _EXTERNAL_RULES_CACHE is not None and _EXTERNAL_RULES_CACHE[0] == mtime:
+        return _EXTERNAL_RULES_CACHE[1]
+
+    out = _parse_external_rules()
+    _EXTERNAL_RULES_CACHE = (mtime, out)
+    return out
 
+
+def _parse_external_rules() -> Dict[str, Dict[str, List[str]]]:
     try:
-        data = json.loads(rules_path.read_text(encoding="utf-8"))
+        data = json.loads(_RULES_PATH.read_text(encoding="utf-8"))
         if not isinstance(data, dict):
             return {}
         out: Dict[str, Dict[str, List[str]]] = {}
@@ -201,101 +289,293 @@ def _load_external_rules_json() -> Dict[str, Dict[str, List[str]]]:
 def _merge_rules(
     base: Dict[str, Dict[str, List[str]]],
     extra: Dict[str, Dict[str, List[str]]],
-    allowed_types: List[str],
-) -> Dict[str, Dict[str, List[str]]]:
-    merged: Dict[str, Dict[str, List[str]]] = {}
-    allowed = set(t.upper() for t in allowed_types)
+    allowed_types: Sequence[str],
+) -> Dict[str, Dict[str, Tuple[str, ...]]]:
+    """
+    Merged rules per allowed type, in allowed_types order.
+    Keyword lists are tuples: the merged ruleset is cached and shared.
+    """
+    merged: Dict[str, Dict[str, Tuple[str, ...]]] = {}
 
-    for t in allowed:
+    for t in _dedupe_keep_order([t.upper() for t in allowed_types]):
         base_t = base.get(t, {"phrases": [], "tokens": []})
         extra_t = extra.get(t, {"phrases": [], "tokens": []})
 
         phrases = _dedupe_keep_order(list(base_t.get("phrases", [])) + list(extra_t.get("phrases", [])))
         tokens = _dedupe_keep_order(list(base_t.get("tokens", [])) + list(extra_t.get("tokens", [])))
 
-        merged[t] = {"phrases": phrases, "tokens": tokens}
+        merged[t] = {"phrases": tuple(phrases), "tokens": tuple(tokens)}
 
     return merged
 
 
-def _detect_type_from_filename_prefix(filename: str, allowed_types: List[str]) -> Optional[str]:
+def _split_name(name: str) -> Tuple[str, str]:
+    """
+    (stem, suffix) of a file name by the same rule as PurePath.stem/.suffix,
+    without building further Path objects per document.
+    """
+    i = name.rfind(".")
+    if 0 < i < len(name) - 1:
+        return name[:i], name[i:]
+    return name, ""
+
+
+def _type_from_folded_stem(folded_stem: str, allowed_types: FrozenSet[str]) -> Optional[str]:
     """
-    If filename starts with a known type code, return it.
+    If the (folded) filename stem starts with a known type code, return it.
     Examples: "PV_...", "VC-...", "UJD ...", "RECLASS...."
     """
-    prepared = _prep_for_search(Path(filename).stem)
-    parts = prepared.split()
+    # split() skips whitespace runs itself, so the stem only needs _fold(), not _squash_ws().
+    parts = folded_stem.split(None, 1)
     if not parts:
         return None
     first = parts[0].upper()
-    if first in set(allowed_types):
+    if first in allowed_types:
         return first
     return None
 
 
-def _best_match(haystack: str, rules: Dict[str, Dict[str, List[str]]], priority: List[str]) -> Tuple[int, str, str]:
+def _trie_regex(words: List[str]) -> str:
+    """
+    Regex alternation for a set of literal words, compiled as a character trie:
+      ["pv", "pj", "proces verbaal"] -> p(?:j|roces\\ verbaal|v)
+    Branches that continue are tried before a branch that ends, so at any position
+    the pattern matches the longest word starting there.
+    """
+    trie: Dict[str, dict] = {}
+    for w in words:
+        node = trie
+        for ch in w:
+            node = node.setdefault(ch, {})
+        node[""] = {}
+
+    def build(node: Dict[str, dict]) -> str:
+        ends = "" in node
+        branches = [re.escape(ch) + build(child) for ch, child in sorted(node.items()) if ch]
+        if not branches:
+            return ""
+        if len(branches) == 1 and not ends:
+            return branches[0]
+        alt = "(?:" + "|".join(branches) + ")"
+        return alt + "?" if ends else alt
+
+    return build(trie)
+
+
+class _RuleMatcher:
+    """
+    All phrases and tokens of a ruleset compiled into two patterns, so a haystack
+    is scanned once per kind instead of once per keyword.
+
+    With pyahocorasick installed, phrases and tokens share one automaton that
+    reports every occurrence; token boundaries are then checked on the neighbouring characters.
+    Otherwise regex matches are collected through a lookahead, so overlapping keywords
+    are all seen (the longest one per start position, which is also the highest scoring one).
+    """
+
+    def __init__(self, rules: Dict[str, Dict[str, Sequence[str]]]):
+        # Doc types are referred to by their index in self.types, so the hot loop in
+        # _best_match compares ints from a flat rank list instead of doing dict lookups.
+        self.types: Tuple[str, ...] = tuple(rules)
+
+        # Keywords are normalized and scored once here:
+        # prepared keyword -> ((score, type index, original keyword), ...)
+        phrases: Dict[str, List[Tuple[int, int, str]]] = {}
+        tokens: Dict[str, List[Tuple[int, int, str]]] = {}
+
+        for type_idx, rule in enumerate(rules.values()):
+            for p in rule.get("phrases", ()):
+                p2 = _prep_keyword(p)
+                if p2:
+                    phrases.setdefault(p2, []).append((100 + len(p2), type_idx, p))
+            for t in rule.get("tokens", ()):
+                t2 = _prep_keyword(t)
+                if t2:
+                    tokens.setdefault(t2, []).append((10 + len(t2), type_idx, t))
+
+        self.phrases: Dict[str, Tuple[Tuple[int, int, str], ...]] = {k: tuple(v) for k, v in phrases.items()}
+        self.tokens: Dict[str, Tuple[Tuple[int, int, str], ...]] = {k: tuple(v) for k, v in tokens.items()}
+        # Highest score any token can reach; a phrase hit above it makes the token pass moot.
+        self.max_token_score = max((10 + len(t) for t in self.tokens), default=0)
+        # Highest score of any keyword, and the types owning a keyword with that score.
+        self.max_score = max(
+            (score for owners in (*self.phrases.values(), *self.tokens.values()) for score, _, _ in owners),
+            default=0,
+        )
+        self.max_score_types = frozenset(
+            type_idx
+            for owners in (*self.phrases.values(), *self.tokens.values())
+            for score, type_idx, _ in owners
+            if score == self.max_score
+        )
+
+        # (priority list, ranks) of the last ranks() lookup.
+        self._last_ranks: Optional[Tuple[List[str], List[int]]] = None
+
+        self.automaton = None
+        self.phrase_re = None
+        self.token_re = None
+
+        if _ahocorasick is not None:
+            try:
+                self.automaton = self._build_automaton()
+                return
+            except Exception:
+                self.automaton = None
+
+        if self.phrases:
+            self.phrase_re = re.compile(f"(?=({_trie_regex(list(self.phrases))}))")
+        if self.tokens:
+            self.token_re = re.compile(f"(?<![a-z0-9])(?=({_trie_regex(list(self.tokens))})(?![a-z0-9]))")
+
+    def _literal_entries(self) -> Dict[str, Tuple[Tuple[int, int, str, bool], ...]]:
+        # keyword -> ((score, type index, original keyword, is_token), ...)
+        entries: Dict[str, List[Tuple[int, int, str, bool]]] = {}
+        for kw, owners in self.phrases.items():
+            entries.setdefault(kw, []).extend(o + (False,) for o in owners)
+        for kw, owners in self.tokens.items():
+            entries.setdefault(kw, []).extend(o + (True,) for o in owners)
+        return {kw: tuple(hits) for kw, hits in entries.items()}
+
+    def _build_automaton(self):
+        automaton = _ahocorasick.Automaton()
+        for kw, hits in self._literal_entries().items():
+            automaton.add_word(kw, (len(kw), hits))
+        automaton.make_automaton()
+        return automaton
+
+    def ranks(self, priority: List[str]) -> List[int]:
+        """
+        Tie-break rank per type index: position in `priority`, unlisted types last.
+        """
+        if self._last_ranks is not None and self._last_ranks[0] is priority:
+            return self._last_ranks[1]
+        priority_index = {t: i for i, t in enumerate(priority)}
+        ranks = [priority_index.get(t, 10**9) for t in self.types]
+        self._last_ranks = (priority, ranks)
+        return ranks
+
+    def is_final(self, score: int, type_idx: int, ranks: List[int]) -> bool:
+        """
+        True when no hit in a longer haystack could replace (score, type_idx):
+        it has the top score and no other type with a top-scoring keyword ranks before it.
+        """
+        if type_idx < 0 or score < self.max_score:
+            return False
+        return all(ranks[type_idx] <= ranks[other] for other in self.max_score_types)
+
+    def best(self, haystack: str, ranks: List[int]) -> Tuple[int, int, str]:
+        """
+        (score, type index, original keyword) of the best hit in haystack, or (0, -1, "").
+        Higher score wins; ties go to the lower rank (see ranks()).
+
+        The keyword scan itself runs in C (automaton or regex engine); only the
+        per-hit selection is Python, so it is kept inline rather than behind a generator.
+        """
+        best_score = 0
+        best_idx = -1
+        best_rank = 10**9
+        best_kw = ""
+
+        if self.automaton is not None:
+            if not haystack:
+                return best_score, best_idx, best_kw
+            last = len(haystack) - 1
+            for end, (length, entries) in self.automaton.iter(haystack):
+                start = end - length + 1
+                bounded = (start == 0 or haystack[start - 1] not in _TOKEN_CHARS) and (
+                    end == last or haystack[end + 1] not in _TOKEN_CHARS
+                )
+                for score, type_idx, orig, is_token in entries:
+                    if (not is_token or bounded) and (
+                        score > best_score or (score == best_score and ranks[type_idx] < best_rank)
+                    ):
+                        best_score, best_idx, best_rank, best_kw = score, type_idx, ranks[type_idx], orig
+            return best_score, best_idx, best_kw
+
+        if self.phrase_re is not None:
+            for m in self.phrase_re.finditer(haystack):
+                for score, type_idx, orig in self.phrases[m.group(1)]:
+                    if score > best_score or (score == best_score and ranks[type_idx] < best_rank):
+                        best_score, best_idx, best_rank, best_kw = score, type_idx, ranks[type_idx], orig
+        # Skip the token scan once a phrase hit outscores every token.
+        if self.token_re is not None and best_score <= self.max_token_score:
+            for m in self.token_re.finditer(haystack):
+                for score, type_idx, orig in self.tokens[m.group(1)]:
+                    if score > best_score or (score == best_score and ranks[type_idx] < best_rank):
+                        best_score, best_idx, best_rank, best_kw = score, type_idx, ranks[type_idx], orig
+        return best_score, best_idx, best_kw
+
+
+# Compiled matchers per ruleset (keyed by the ruleset contents).
+_MATCHERS: Dict[tuple, _RuleMatcher] = {}
+
+# (rules, matcher) of the last lookup. Holding `rules` keeps its id() from being reused,
+# so the memoized ruleset from _load_classification_rules() skips the key build.
+_LAST_MATCHER: Optional[Tuple[dict, _RuleMatcher]] = None
+
+
+def _get_matcher(rules: Dict[str, Dict[str, Sequence[str]]]) -> _RuleMatcher:
+    global _LAST_MATCHER
+    if _LAST_MATCHER is not None and _LAST_MATCHER[0] is rules:
+        return _LAST_MATCHER[1]
+
+    key = tuple(
+        (doc_type, tuple(rule.get("phrases", [])), tuple(rule.get("tokens", [])))
+        for doc_type, rule in rules.items()
+    )
+    matcher = _MATCHERS.get(key)
+    if matcher is None:
+        if len(_MATCHERS) >= 8:
+            _MATCHERS.clear()
+        matcher = _RuleMatcher(rules)
+        _MATCHERS[key] = matcher
+    _LAST_MATCHER = (rules, matcher)
+    return matcher
+
+
+def _best_match(haystack: str, rules: Dict[str, Dict[str, Sequence[str]]], priority: List[str]) -> Tuple[int, str, str]:
     """
     Returns (score, doc_type, matched_keyword).
 
     Scoring:
       - phrase match: 100 + len(phrase)  (phrases are more specific)
       - token match:  10 + len(token)
+    Ties go to the type listed first in `priority`.
     """
-    best_score = 0
-    best_type = ""
-    best_kw = ""
-
-    priority_index = {t: i for i, t in enumerate(priority)}
-
-    for doc_type, rule in rules.items():
-        # phrases
-        for p in rule.get("phrases", []):
-            p2 = _prep_for_search(p)
-            if p2 and p2 in haystack:
-                score = 100 + len(p2)
-                if (score > best_score) or (
-                    score == best_score and priority_index.get(doc_type, 10**9) < priority_index.get(best_type, 10**9)
-                ):
-                    best_score = score
-                    best_type = doc_type
-                    best_kw = p
-
-        # tokens
-        for t in rule.get("tokens", []):
-            t2 = _prep_for_search(t)
-            if t2 and _token_match(haystack, t2):
-                score = 10 + len(t2)
-                if (score > best_score) or (
-                    score == best_score and priority_index.get(doc_type, 10**9) < priority_index.get(best_type, 10**9)
-                ):
-                    best_score = score
-                    best_type = doc_type
-                    best_kw = t
-
-    return best_score, best_type, best_kw
+    score, dtype, kw, _ = _best_match_final(haystack, rules, priority)
+    return score, dtype, kw
 
 
-def classify_document(path: Path, text: str, *, verbose: bool = False) -> str:
+def _best_match_final(
+    haystack: str, rules: Dict[str, Dict[str, Sequence[str]]], priority: List[str]
+) -> Tuple[int, str, str, bool]:
     """
-    Classify document by:
-      1) filename prefix code (if present)
-      2) keyword rules on filename
-      3) keyword rules on content
+    _best_match() plus whether the hit is final (see _RuleMatcher.is_final()).
+    """
+    matcher = _get_matcher(rules)
+    ranks = matcher.ranks(priority)
+    best_score, best_idx, best_kw = matcher.best(haystack, ranks)
+    dtype = matcher.types[best_idx] if best_idx >= 0 else ""
+    return best_score, dtype, best_kw, matcher.is_final(best_score, best_idx, ranks)
 
-    Returns a type that exists in PROMPT_FILES (or UNKNOWN).
+
+def _load_classification_rules() -> Tuple[FrozenSet[str], Dict[str, Dict[str, Tuple[str, ...]]], List[str]]:
     """
-    allowed_types = _get_allowed_types_from_config()
+    Returns (allowed_types, rules, priority) for the current config + rules file;
+    allowed_types is a frozenset for the per-document prefix check.
+    Rebuilt only when nomenclature_rules.json changes; the returned objects are
+    shared and must not be modified.
+    """
+    return _build_classification_rules(_rules_file_mtime())
 
-    # 1) filename prefix (strong signal)
-    by_prefix = _detect_type_from_filename_prefix(path.name, allowed_types)
-    if by_prefix:
-        if verbose:
-            print(f"Detected type from filename prefix: {by_prefix}")
-        return by_prefix
 
-    # Prepare searchable strings
-    name_search = _prep_for_search(path.name)
-    content_search = _prep_for_search((text or "")[:8000])
+@lru_cache(maxsize=1)
+def _build_classification_rules(
+    rules_mtime: Optional[int],
+) -> Tuple[FrozenSet[str], Dict[str, Dict[str, Tuple[str, ...]]], List[str]]:
+    # rules_mtime is only the cache key (None: no external rules file).
+    allowed_types = _get_allowed_types_from_config()
 
     # Load + merge rules (default + optional external json)
     base = _default_rules()
@@ -315,6 +595,29 @@ def classify_document(path: Path, text: str, *, verbose: bool = False) -> str:
         "TLL",
     ] + [t for t in allowed_types if t not in {"VC", "PJ", "PV", "RECLASS", "UJD", "TLL"}]
 
+    return frozenset(allowed_types), rules, priority
+
+
+def _classify_with_rules(
+    path: Path,
+    text: str,
+    allowed_types: FrozenSet[str],
+    rules: Dict[str, Dict[str, Sequence[str]]],
+    priority: List[str],
+    verbose: bool = False,
+) -> str:
+    # 1) filename prefix (strong signal)
+    # (the folded stem is reused for the filename keywords; content is only prepared after that)
+    stem, suffix = _split_name(path.name)
+    stem = _fold(stem)
+    by_prefix = _type_from_folded_stem(stem, allowed_types)
+    if by_prefix:
+        if verbose:
+            print(f"Detected type from filename prefix: {by_prefix}")
+        return by_prefix
+
+    name_search = _squash_ws(stem + _fold(suffix))
+
     # 2) keyword rules on filename
     score, dtype, kw = _best_match(name_search, rules, priority)
     if score > 0 and dtype:
@@ -322,8 +625,16 @@ def classify_document(path: Path, text: str, *, verbose: bool = False) -> str:
             print(f"Detected type from filename keywords: {dtype} (keyword: '{kw}')")
         return dtype
 
-    # 3) keyword rules on content
-    score, dtype, kw = _best_match(content_search, rules, priority)
+    # 3) keyword rules on content: head first, full window only if needed
+    # (the head is folded once and reused for the full window, only the rest is added)
+    text = text or ""
+    head = _fold(text[:CONTENT_FAST_CHARS])
+    score, dtype, kw, final = _best_match_final(_squash_ws(head), rules, priority)
+    if not final and len(text) > CONTENT_FAST_CHARS:
+        if verbose:
+            print("No unbeatable match in document head -> scanning full window")
+        full = head + _fold(text[CONTENT_FAST_CHARS:CONTENT_FULL_CHARS])
+        score, dtype, kw = _best_match(_squash_ws(full), rules, priority)
     if score > 0 and dtype:
         if verbose:
             print(f"Detected type from content keywords: {dtype} (keyword: '{kw}')")
@@ -332,3 +643,28 @@ def classify_document(path: Path, text: str, *, verbose: bool = False) -> str:
     if verbose:
         print("No type detected -> UNKNOWN")
     return "UNKNOWN"
+
+
+def classify_document(path: Path, text: str, *, verbose: bool = False) -> str:
+    """
+    Classify document by:
+      1) filename prefix code (if present)
+      2) keyword rules on filename
+      3) keyword rules on content
+
+    Returns a type that exists in PROMPT_FILES (or UNKNOWN).
+    """
+    allowed_types, rules, priority = _load_classification_rules()
+    return _classify_with_rules(path, text, allowed_types, rules, priority, verbose)
+
+
+def classify_documents(items: List[Tuple[Path, str]], *, verbose: bool = False) -> List[str]:
+    """
+    Batch version of classify_document() for (path, text) pairs.
+    The config and rules are loaded once for the whole batch instead of once per file.
+    """
+    if not items:
+        return []
+    allowed_types, rules, priority = _load_classification_rules()
+    return [_classify_with_rules(path, text, allowed_types, rules, priority, verbose) for path, text in items]
+
@@ -2,9 +2,16 @@
 
 import os
 import sys
+from functools import lru_cache
 from pathlib import Path
+from types import MappingProxyType
 
+# Runtime flavour, resolved once at import.
+IS_FROZEN = bool(getattr(sys, "frozen", False))
+IS_FROZEN_MAC = IS_FROZEN and sys.platform == "darwin"
 
+
+@lru_cache(maxsize=None)
 def get_backend_dir() -> Path:
     """
     Return the folder that contains backend/ resources.
@@ -12,11 +19,12 @@ def get_backend_dir() -> Path:
     - In source run: .../backend
     - In PyInstaller: sys._MEIPASS/backend
     """
-    if getattr(sys, "frozen", False) and hasattr(sys, "_MEIPASS"):
+    if IS_FROZEN and hasattr(sys, "_MEIPASS"):
         return Path(sys._MEIPASS) / "backend"  # type: ignore[attr-defined]
     return Path(__file__).resolve().parent
 
 
+@lru_cache(maxsize=None)
 def get_user_data_dir(app_name: str = "ForensicSummarizer") -> Path:
     """
     Return a writable per-user data directory.
@@ -50,19 +58,33 @@ EXTRACTED_DIR = USER_DATA_DIR / "extracted_documents"
 OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
 EXTRACTED_DIR.mkdir(parents=True, exist_ok=True)
 
+# --- Classification cache (sha256 of file contents -> doc_type/text) ---
+# One per case, inside the case folder: deleting a case also deletes its cached texts.
+CLASSIFICATION_CACHE_FILENAME = "classification_cache.sqlite"
+# Former app-wide location; removed at startup (classification_cache.remove_legacy_cache()).
+LEGACY_CLASSIFICATION_CACHE_PATH = USER_DATA_DIR / CLASSIFICATION_CACHE_FILENAME
+
 # --- Final report outputs (if used) ---
 FINAL_REPORT_PATH = OUTPUT_DIR / "final_report.txt"
 FINAL_REPORT_PDF_PATH = OUTPUT_DIR / "final_report.pdf"
 
 # --- LLM runtime params ---
-MAX_CHARS_PER_CHUNK = 1800
+# 0 = chunk size follows the context budget (N_CTX - prompt - MAX_NEW_TOKENS);
+# a positive value caps it in characters.
+MAX_CHARS_PER_CHUNK = 0
 N_CTX = 2048
+# FS_MLOCK=1 pins the model weights in RAM (no paging, but the whole ~4.4 GB stays
+# resident for the session); off by default to spare 8 GB machines.
+USE_MLOCK = os.environ.get("FS_MLOCK", "").strip() == "1"
 MAX_NEW_TOKENS = 180
 AGGREGATE_GROUP_SIZE = 4
 AGGREGATE_MAX_PARTIALS = 6
+# Fewer partial summaries than this are joined as-is, without a REDUCE pass.
+AGGREGATE_MIN_PARTIALS = 4
 
 # --- Mapping: doc type -> prompt file ---
-PROMPT_FILES = {
+# (read-only: the classifier derives its allowed types from these keys once per process)
+PROMPT_FILES = MappingProxyType({
     "PV": PROMPTS_DIR / "pv.txt",
     "VC": PROMPTS_DIR / "vc.txt",
     "RECLASS": PROMPTS_DIR / "reclass.txt",
@@ -70,25 +92,106 @@ PROMPT_FILES = {
     "PJ": PROMPTS_DIR / "pj_old.txt",
     "TLL": PROMPTS_DIR / "tll.txt",
     "UNKNOWN": PROMPTS_DIR / "unknown.txt",
-}
+})
+
+
+@lru_cache(maxsize=16)
+def _read_prompt_cached(path_str: str, mtime_ns: int) -> str:
+    return Path(path_str).read_text(encoding="utf-8")
+
+
+def read_prompt(path: Path) -> str:
+    """
+    Prompt file contents, read from disk only when the file changed (mtime is part of the key).
+    """
+    path = Path(path)
+    return _read_prompt_cached(str(path), path.stat().st_mtime_ns)
+
+
+def get_prompt(doc_type: str) -> str:
+    """
+    Prompt template for a doc type (UNKNOWN's for unmapped types), via read_prompt().
+    """
+    path = PROMPT_FILES.get((doc_type or "").upper()) or PROMPT_FILES["UNKNOWN"]
+    return read_prompt(path)
+
 
 # --- Model download settings (first-run download) ---
-MODEL_FILENAME = "Mistral-7B-Instruct-v0.3-Q4_K_M.gguf"
+# FS_MODEL_QUANT picks a smaller quantisation of the same model (e.g. Q3_K_M, Q2_K):
+# fewer weight bytes per token, so faster generation at some cost in quality.
+# Decoding reads every weight once per token, so speed follows file size almost linearly:
+# Q4_K_M (~4.4 GB) is about half of Q8_0 and a quarter of F16, with little quality loss,
+# which is why it is the default (Q8_0/F16 are deliberately not offered).
+# Q4_0 has the simplest 4-bit kernels and is usually the fastest on CPU-only machines;
+# like every non-default choice it needs FS_MODEL_SHA256 (see MODEL_SHA256S below).
+# FS_FAST=1 switches to TinyLlama-1.1B-Chat (same quantisation names) for slow machines.
+DEFAULT_MODEL_QUANT = "Q4_K_M"
+MODEL_QUANTS = ("Q2_K", "Q3_K_S", "Q3_K_M", "Q3_K_L", "Q4_0", "Q4_K_S", "Q4_K_M")
+
+# (repository, filename pattern, ctransformers model_type) per model family.
+MODEL_FAMILIES = MappingProxyType({
+    "mistral": (
+        "bartowski/Mistral-7B-Instruct-v0.3-GGUF",
+        "Mistral-7B-Instruct-v0.3-{quant}.gguf",
+        "mistral",
+    ),
+    "tinyllama": (
+        "TheBloke/TinyLlama-1.1B-Chat-v1.0-GGUF",
+        "tinyllama-1.1b-chat-v1.0.{quant}.gguf",
+        "llama",
+    ),
+})
+
+# Published SHA-256 per (family, quantisation). Every download is verified, so any other
+# choice needs its digest in FS_MODEL_SHA256 (copy it from the file page of the model repo).
+MODEL_SHA256S = MappingProxyType({
+    ("mistral", "Q4_K_M"): "1270d22c0fbb3d092fb725d4d96c457b7b687a5f5a715abe1e818da303e562b6",
+})
+
+
+def _select_model() -> tuple:
+    """
+    Resolve (family, quant, sha256) from FS_FAST / FS_MODEL_QUANT / FS_MODEL_SHA256.
+
+    Falls back to the default Mistral Q4_K_M, with a warning, when the choice is unknown
+    or has no digest to verify the download against.
+    """
+    default = ("mistral", DEFAULT_MODEL_QUANT, MODEL_SHA256S[("mistral", DEFAULT_MODEL_QUANT)])
+    family = "tinyllama" if os.environ.get("FS_FAST", "").strip() == "1" else "mistral"
+    quant = os.environ.get("FS_MODEL_QUANT", "").strip().upper() or DEFAULT_MODEL_QUANT
+    if quant not in MODEL_QUANTS:
+        print(f"[config] FS_MODEL_QUANT={quant!r} is not one of {', '.join(MODEL_QUANTS)}; "
+              f"using {DEFAULT_MODEL_QUANT}.")
+        quant = DEFAULT_MODEL_QUANT
+
+    sha = MODEL_SHA256S.get((family, quant))
+    if sha is None:
+        sha = os.environ.get("FS_MODEL_SHA256", "").strip().lower()
+        if len(sha) != 64 or any(c not in "0123456789abcdef" for c in sha):
+            print(f"[config] No SHA-256 for {family} {quant}: set FS_MODEL_SHA256 to the digest "
+                  f"published for that file; using mistral {DEFAULT_MODEL_QUANT}.")
+            return default
+    return family, quant, sha
+
+
+MODEL_FAMILY, MODEL_QUANT, MODEL_SHA256 = _select_model()
+_MODEL_REPO, _MODEL_FILE_PATTERN, MODEL_TYPE = MODEL_FAMILIES[MODEL_FAMILY]
+
+MODEL_FILENAME = _MODEL_FILE_PATTERN.format(quant=MODEL_QUANT)
 
 MODEL_URL = (
-    "https://huggingface.co/bartowski/Mistral-7B-Instruct-v0.3-GGUF/resolve/main/"
-    "Mistral-7B-Instruct-v0.3-Q4_K_M.gguf?download=true"
+    f"https://huggingface.co/{_MODEL_REPO}/resolve/main/"
+    f"{MODEL_FILENAME}?download=true"
 )
 
-MODEL_SHA256 = "1270d22c0fbb3d092fb725d4d96c457b7b687a5f5a715abe1e818da303e562b6"
-
 
+@lru_cache(maxsize=None)
 def get_bundled_model_path() -> Path:
     """
     Path to a model bundled inside a PyInstaller macOS .app (legacy builds).
     IMPORTANT: we do NOT want to write into the .app after signing, only read if present.
     """
-    if getattr(sys, "frozen", False) and sys.platform == "darwin":
+    if IS_FROZEN_MAC:
         exe_path = Path(sys.executable).resolve()
         contents_dir = exe_path.parent.parent  # .../Contents
         resources_dir = contents_dir / "Resources"
@@ -98,10 +201,12 @@ def get_bundled_model_path() -> Path:
     return BASE_DIR / "llm_models" / MODEL_FILENAME
 
 
+@lru_cache(maxsize=None)
 def get_model_path() -> Path:
     """
     Prefer user-writable model location (for first-run download).
     If user model doesn't exist yet but a bundled model exists, use the bundled one.
+    Resolved once per process (like the former import-time MODEL_PATH).
     """
     user_models_dir = USER_DATA_DIR / "llm_models"
     user_models_dir.mkdir(parents=True, exist_ok=True)
@@ -117,7 +222,12 @@ def get_model_path() -> Path:
     return user_model_path
 
 
-MODEL_PATH = get_model_path()
+def __getattr__(name: str):
+    # MODEL_PATH is resolved on first use instead of at import (mkdir + stat + resolve),
+    # so modules that only need PROMPT_FILES etc. skip those syscalls.
+    if name == "MODEL_PATH":
+        return get_model_path()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 # --- Optional / legacy (kept for compatibility) ---
 OLLAMA_HOST = "http://127.0.0.1:11434"
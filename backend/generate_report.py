@@ -1,19 +1,56 @@
 # generate_report.py
 
+import os
 from collections import defaultdict
 from pathlib import Path
 
-from backend.config import OUTPUT_DIR, FINAL_REPORT_PATH, PROMPTS_DIR
+from backend.config import OUTPUT_DIR, FINAL_REPORT_PATH, PROMPTS_DIR, read_prompt
 from backend.ollama_client import generate
 
 # Prompt template for final report
 PROMPT_TEMPLATE_PATH = PROMPTS_DIR / "final_report.txt"
 
 
+# directory -> (fingerprint, summaries) of the last collect_summaries() call
+_SUMMARY_CACHE: dict = {}
+
+
+def _scan_summary_files(directory) -> list:
+    """
+    DirEntry objects of all "*_summary.txt" files below directory, in rglob() order
+    (files of a folder first, then its subfolders), from one scandir per folder.
+    """
+    found = []
+    subdirs = []
+    with os.scandir(directory) as it:
+        for entry in it:
+            if entry.is_dir(follow_symlinks=False):
+                subdirs.append(entry.path)
+            elif entry.name.endswith("_summary.txt") and entry.is_file():
+                found.append(entry)
+    for sub in subdirs:
+        found.extend(_scan_summary_files(sub))
+    return found
+
+
 def collect_summaries(directory: Path) -> dict:
+    entries = _scan_summary_files(directory)
+    files = [Path(e.path) for e in entries]
+
+    # (path, mtime, size) per file: unchanged summaries are not read again on a rerun
+    fingerprint = []
+    for entry in entries:
+        st = entry.stat()
+        fingerprint.append((entry.path, st.st_mtime_ns, st.st_size))
+    fingerprint = tuple(fingerprint)
+
+    cached = _SUMMARY_CACHE.get(directory)
+    if cached is not None and cached[0] == fingerprint:
+        return defaultdict(list, {k: list(v) for k, v in cached[1].items()})
+
     summaries = defaultdict(list)
 
-    for file in directory.rglob("*_summary.txt"):
+    for file in files:
         # Extract document type from file name
         doc_type_raw = file.name.split("_")[0]
         doc_type = ''.join(filter(str.isalpha, doc_type_raw)).upper()
@@ -21,6 +58,7 @@ def collect_summaries(directory: Path) -> dict:
         text = file.read_text(encoding="utf-8").strip()
         summaries[doc_type].append(text)
 
+    _SUMMARY_CACHE[directory] = (fingerprint, {k: list(v) for k, v in summaries.items()})
     return summaries
 
 
@@ -28,14 +66,14 @@ def build_prompt(summaries_by_type: dict) -> str:
     if not PROMPT_TEMPLATE_PATH.exists():
         raise FileNotFoundError(f"Prompt template not found: {PROMPT_TEMPLATE_PATH}")
 
-    base_prompt = PROMPT_TEMPLATE_PATH.read_text(encoding="utf-8").strip() + "\n\n"
+    # Parts are joined once at the end (repeated += copies the growing prompt each time).
+    parts = [read_prompt(PROMPT_TEMPLATE_PATH).strip() + "\n\n"]
 
     for doc_type, summaries in summaries_by_type.items():
-        base_prompt += f"=== Documenttype: {doc_type} ===\n"
-        for i, summary in enumerate(summaries, 1):
-            base_prompt += f"- Samenvatting {i}:\n{summary}\n\n"
+        parts.append(f"=== Documenttype: {doc_type} ===\n")
+        parts.extend(f"- Samenvatting {i}:\n{summary}\n\n" for i, summary in enumerate(summaries, 1))
 
-    return base_prompt
+    return "".join(parts)
 
 
 def main():
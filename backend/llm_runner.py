@@ -1,6 +1,11 @@
+import os
+import platform
 import sys
+import threading
 from pathlib import Path
 
+from backend.config import MAX_NEW_TOKENS, USE_MLOCK
+
 MODEL_PATH = Path(__file__).parent.parent / "models" / "tinyllama-1.1b-chat-v1.0.Q4_K_M.gguf"
 
 try:
@@ -8,22 +13,39 @@ try:
 except ImportError:
     Llama = None  # Можна поставити заглушку
 
-llm = None
+_LLM = None
+_LLM_LOCK = threading.Lock()
+
+# Apple Silicon: offload all layers to Metal (needs llama-cpp-python built with Metal).
+USE_METAL = sys.platform == "darwin" and platform.machine() == "arm64"
 
 def load_model():
-    global llm
-    if llm is None and Llama is not None:
-        llm = Llama(
-            model_path=str(MODEL_PATH),
-            n_ctx=2048,
-            n_threads=4,
-            verbose=False,
-        )
+    """
+    Load the model once per process (double-checked lock: concurrent callers
+    never construct a second multi-GB Llama).
+    """
+    global _LLM
+    if _LLM is not None or Llama is None:
+        return _LLM
+    with _LLM_LOCK:
+        if _LLM is None:
+            kwargs = {}
+            if USE_METAL:
+                kwargs = {"n_gpu_layers": -1, "n_batch": 512, "use_mlock": USE_MLOCK}
+            _LLM = Llama(
+                model_path=str(MODEL_PATH),
+                n_ctx=2048,
+                n_threads=max(1, (os.cpu_count() or 2) // 2) if USE_METAL else 4,
+                verbose=False,
+                **kwargs,
+            )
+    return _LLM
 
 def generate(prompt: str) -> str:
     if Llama is None:
         raise RuntimeError("llama_cpp is not available in this environment.")
 
-    load_model()
-    output = llm(prompt=prompt, stop=["</s>"])
+    llm = load_model()
+    # Bounded like the summarizer: decoding stops after MAX_NEW_TOKENS.
+    output = llm(prompt=prompt, max_tokens=MAX_NEW_TOKENS, stop=["</s>"], temperature=0.2)
     return output["choices"][0]["text"]
@@ -4,6 +4,7 @@ from __future__ import annotations
 
 import hashlib
 import os
+import shutil
 import time
 from pathlib import Path
 from typing import Callable, Optional
@@ -15,6 +16,9 @@ from backend.config import MODEL_PATH, MODEL_URL, MODEL_SHA256
 
 ProgressCb = Optional[Callable[[str], None]]
 
+# Shared session: a retried download reuses the pooled connection (TLS handshake included).
+_SESSION = requests.Session()
+
 
 def _fmt_bytes(n: int) -> str:
     gb = 1024**3
@@ -24,6 +28,58 @@ def _fmt_bytes(n: int) -> str:
     return f"{n / mb:.1f} MB"
 
 
+# Download copy buffer: resp.raw is read straight into the file in 16 MiB blocks.
+_DOWNLOAD_BUFSIZE = 16 * 1024 * 1024
+
+
+class _ProgressWriter:
+    """
+    File wrapper for shutil.copyfileobj(): counts bytes and reports progress (at most every 0.5 s).
+    """
+
+    def __init__(self, f, total: Optional[int], progress_cb: ProgressCb, start: int = 0):
+        self._f = f
+        self._total = total
+        self._progress_cb = progress_cb
+        self._last_update = 0.0
+        self.downloaded = start
+
+    def write(self, b) -> int:
+        n = self._f.write(b)
+        self.downloaded += len(b)
+
+        now = time.time()
+        if self._progress_cb and (now - self._last_update) > 0.5:
+            self._last_update = now
+            if self._total:
+                pct = int(self.downloaded * 100 / self._total)
+                self._progress_cb(
+                    f"Downloading model... {pct}% ({_fmt_bytes(self.downloaded)} / {_fmt_bytes(self._total)})"
+                )
+            else:
+                self._progress_cb(f"Downloading model... {_fmt_bytes(self.downloaded)}")
+        return n
+
+
+def _sha256_file(path: Path) -> str:
+    """
+    SHA-256 of a file in one pass: hashlib.file_digest (3.11+) or a readinto loop
+    over a reused buffer on older Pythons.
+    """
+    with open(path, "rb") as fh:
+        if hasattr(hashlib, "file_digest"):
+            return hashlib.file_digest(fh, "sha256").hexdigest()
+        hasher = hashlib.sha256()
+        buf = bytearray(4 * 1024 * 1024)
+        view = memoryview(buf)
+        while True:
+            n = fh.readinto(buf)
+            if not n:
+                break
+            hasher.update(view[:n])
+        return hasher.hexdigest()
+
+
 def ensure_model_ready(progress_cb: ProgressCb = None) -> Path:
     """
     Ensure the GGUF model exists at MODEL_PATH (user-writable dir).
@@ -50,59 +106,61 @@ def ensure_model_ready(progress_cb: ProgressCb = None) -> Path:
     os.environ.setdefault("SSL_CERT_FILE", ca_path)
     os.environ.setdefault("REQUESTS_CA_BUNDLE", ca_path)
 
+    # Never install an unverified model (also covers a resumed .part answered with 416).
+    if not MODEL_SHA256:
+        raise RuntimeError(f"No known SHA-256 for {model_path.name}; refusing to download it.")
+
     tmp_path = model_path.with_suffix(model_path.suffix + ".part")
 
     if progress_cb:
         progress_cb(f"LLM model not found. Downloading to: {model_path}")
 
-    # Clean stale partial file
-    try:
-        if tmp_path.exists():
-            tmp_path.unlink(missing_ok=True)
-    except Exception:
-        pass
-
     headers = {"User-Agent": "ForensicSummarizer/1.0 (model-downloader)"}
 
-    hasher = hashlib.sha256() if MODEL_SHA256 else None
-    downloaded = 0
-    last_update = 0.0
+    # Resume an interrupted download: ask only for the bytes after the existing .part file.
+    # (The checksum below covers the whole file, so a bad resume is caught there.)
+    try:
+        start = tmp_path.stat().st_size if tmp_path.exists() else 0
+    except OSError:
+        start = 0
+    if start:
+        headers["Range"] = f"bytes={start}-"
+        headers["Accept-Encoding"] = "identity"
+        if progress_cb:
+            progress_cb(f"Resuming download at {_fmt_bytes(start)}")
+
+    downloaded = start
     started = time.time()
 
     # Use streaming download
     try:
-        with requests.get(
+        with _SESSION.get(
             MODEL_URL,
             headers=headers,
             stream=True,
             timeout=(10, 300),
             verify=ca_path,
         ) as resp:
-            resp.raise_for_status()
-
-            total = resp.headers.get("Content-Length")
-            total_int = int(total) if total and total.isdigit() else None
-
-            with open(tmp_path, "wb") as f:
-                for chunk in resp.iter_content(chunk_size=4 * 1024 * 1024):
-                    if not chunk:
-                        continue
-                    f.write(chunk)
-                    downloaded += len(chunk)
-
-                    if hasher:
-                        hasher.update(chunk)
-
-                    now = time.time()
-                    if progress_cb and (now - last_update) > 0.5:
-                        last_update = now
-                        if total_int:
-                            pct = int(downloaded * 100 / total_int)
-                            progress_cb(
-                                f"Downloading model... {pct}% ({_fmt_bytes(downloaded)} / {_fmt_bytes(total_int)})"
-                            )
-                        else:
-                            progress_cb(f"Downloading model... {_fmt_bytes(downloaded)}")
+            if start and resp.status_code == 416:
+                # Nothing left to fetch: the .part file is already complete.
+                pass
+            else:
+                resp.raise_for_status()
+
+                # 206: the server honoured the Range, append; 200: full body, start over.
+                resumed = start > 0 and resp.status_code == 206
+                if not resumed:
+                    start = 0
+
+                total = resp.headers.get("Content-Length")
+                total_int = start + int(total) if total and total.isdigit() else None
+
+                # Copy the raw stream in large blocks (decoded like iter_content would).
+                resp.raw.decode_content = True
+                with open(tmp_path, "ab" if resumed else "wb") as f:
+                    writer = _ProgressWriter(f, total_int, progress_cb, start=start)
+                    shutil.copyfileobj(resp.raw, writer, _DOWNLOAD_BUFSIZE)
+                    downloaded = writer.downloaded
 
     except requests.exceptions.SSLError as e:
         # This is the exact error your client sees (CERTIFICATE_VERIFY_FAILED).
@@ -116,19 +174,20 @@ def ensure_model_ready(progress_cb: ProgressCb = None) -> Path:
     except Exception as e:
         raise RuntimeError(f"Failed to download model: {e}") from e
 
-    # Verify checksum if provided
-    if hasher and MODEL_SHA256:
-        digest = hasher.hexdigest().lower()
-        expected = MODEL_SHA256.strip().lower()
-        if digest != expected:
-            try:
-                tmp_path.unlink(missing_ok=True)
-            except Exception:
-                pass
-            raise RuntimeError(
-                "Downloaded model checksum mismatch. "
-                f"Expected {expected}, got {digest}."
-            )
+    # Verify checksum (hashed after the download, in one pass over the file)
+    if progress_cb:
+        progress_cb("Verifying model checksum...")
+    digest = _sha256_file(tmp_path).lower()
+    expected = MODEL_SHA256.strip().lower()
+    if digest != expected:
+        try:
+            tmp_path.unlink(missing_ok=True)
+        except Exception:
+            pass
+        raise RuntimeError(
+            "Downloaded model checksum mismatch. "
+            f"Expected {expected}, got {digest}."
+        )
 
     # Atomic replace
     tmp_path.replace(model_path)
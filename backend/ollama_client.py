@@ -2,10 +2,16 @@
 
 import json
 import requests
+from requests.adapters import HTTPAdapter
 from typing import Generator
 
 from backend.config import OLLAMA_HOST, OLLAMA_MODEL
 
+# One pooled session for all generate() calls, so the connection to Ollama is reused.
+_SESSION = requests.Session()
+_SESSION.mount("http://", HTTPAdapter(pool_connections=4, pool_maxsize=4))
+_SESSION.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=4))
+
 
 def generate(prompt: str) -> str:
     """
@@ -17,7 +23,7 @@ def generate(prompt: str) -> str:
         "prompt": prompt,
         "stream": False,
     }
-    resp = requests.post(url, json=payload, timeout=600)
+    resp = _SESSION.post(url, json=payload, timeout=600)
     resp.raise_for_status()
     data = resp.json()
     return data.get("response", "")
@@ -2,49 +2,77 @@
 
 import os
 import json
+import multiprocessing
 import shutil
 import zipfile
-import tempfile
+import threading
 import re
+import struct
+import sys
+import zlib
+from collections import deque
+from concurrent.futures import BrokenExecutor, Executor, ProcessPoolExecutor, ThreadPoolExecutor
 from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
 
-from backend.text_extraction import extract_text
-from backend.classifiers import classify_document
-from backend.summarizer import summarize_document
+# extract_text / classify_document / summarize_document are imported where they are used:
+# the summarizer pulls in the LLM runtime, which importers of the ZIP/meta helpers
+# (summarizer_worker, the UI) should not pay for at import time.
 
 # Import absolute paths from config (cross-platform + PyInstaller-safe)
 from backend.config import OUTPUT_DIR, EXTRACTED_DIR
+from backend.state import discard_dir
+
+try:
+    # libdeflate bindings: ~2x faster inflate than zlib for whole-buffer decompression.
+    import deflate as _libdeflate
+except ImportError:
+    _libdeflate = None
+
+try:
+    # orjson: much faster JSON encoding for the per-document summary files.
+    import orjson as _orjson
+except ImportError:
+    _orjson = None
 
 # Ensure folders exist
 OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
 EXTRACTED_DIR.mkdir(parents=True, exist_ok=True)
 
 
+_SKIP_PREFIXES = ("__MACOSX/",)
+_SKIP_NAMES = frozenset({".DS_Store"})
+
+
 def _should_skip_member(name: str) -> bool:
     """
     Skip macOS metadata files and other non-document artifacts commonly found in ZIPs:
     - __MACOSX folder
     - AppleDouble files (._filename)
     - .DS_Store
+    (plain string checks: this runs for every entry of the archive)
     """
-    n = name.replace("\\", "/")
+    n = name.replace("\\", "/") if "\\" in name else name
 
     # Skip directories
     if n.endswith("/"):
         return True
 
     # Skip macOS metadata folder
-    if n.startswith("__MACOSX/") or "/__MACOSX/" in n:
+    if n.startswith(_SKIP_PREFIXES) or "/__MACOSX/" in n:
         return True
 
-    base = Path(n).name
+    base = n.rpartition("/")[2]
+    if base == ".":
+        # "dir/." style names: last real component, as Path(n).name would give
+        base = next((p for p in reversed(n.split("/")) if p not in ("", ".")), "")
 
     # Skip AppleDouble metadata files
     if base.startswith("._"):
         return True
 
     # Skip Finder artifact
-    if base == ".DS_Store":
+    if base in _SKIP_NAMES:
         return True
 
     return False
@@ -53,19 +81,23 @@ def _should_skip_member(name: str) -> bool:
 def _safe_clear_dir(dir_path: Path) -> None:
     """
     Remove all files and folders inside the given directory.
+    (scandir: the file type comes with the directory listing, no stat per entry)
     """
-    if not dir_path.exists():
+    try:
+        it = os.scandir(dir_path)
+    except OSError:
         return
 
-    for p in dir_path.iterdir():
-        try:
-            if p.is_dir():
-                shutil.rmtree(p, ignore_errors=True)
-            else:
-                p.unlink(missing_ok=True)
-        except Exception:
-            # Best-effort cleanup; do not crash processing.
-            pass
+    with it:
+        for entry in it:
+            try:
+                if entry.is_dir(follow_symlinks=False):
+                    shutil.rmtree(entry.path, ignore_errors=True)
+                else:
+                    os.unlink(entry.path)
+            except Exception:
+                # Best-effort cleanup; do not crash processing.
+                pass
 
 
 def _unique_target_path(dst_dir: Path, filename: str) -> Path:
@@ -88,6 +120,236 @@ def _unique_target_path(dst_dir: Path, filename: str) -> Path:
         i += 1
 
 
+# Copy buffer for streaming ZIP entries to disk (zipfile.extract uses 64 KiB).
+_COPY_BUFSIZE = 1 << 20
+
+
+def _member_target(dst_dir: Path, name: str) -> Path:
+    """
+    Target path of a ZIP member below dst_dir (drive and '..' parts dropped, like zipfile does).
+    """
+    name = os.path.splitdrive(name.replace("\\", "/"))[1]
+    parts = [p for p in name.split("/") if p not in ("", ".", "..")]
+    return dst_dir.joinpath(*parts)
+
+
+# Entries up to this size are inflated in one libdeflate call (whole entry in memory).
+_LIBDEFLATE_MAX_SIZE = 256 * 1024 * 1024
+
+_LOCAL_HEADER = struct.Struct("<4s2B4HL2L2H")  # same layout as zipfile.structFileHeader
+
+
+def _read_raw_member(raw_fp, info: zipfile.ZipInfo) -> bytes:
+    """
+    Compressed bytes of an entry, read via its local file header.
+    """
+    raw_fp.seek(info.header_offset)
+    header = _LOCAL_HEADER.unpack(raw_fp.read(_LOCAL_HEADER.size))
+    if header[0] != b"PK\x03\x04":
+        raise zipfile.BadZipFile(f"Bad local header for {info.filename}")
+    name_len, extra_len = header[10], header[11]
+    raw_fp.seek(name_len + extra_len, os.SEEK_CUR)
+    return raw_fp.read(info.compress_size)
+
+
+def _inflate_with_libdeflate(raw_fp, info: zipfile.ZipInfo) -> Optional[bytes]:
+    """
+    Whole-entry inflate with libdeflate, or None when the entry needs the zipfile path
+    (libdeflate missing, not DEFLATE, encrypted, too large).
+    """
+    if _libdeflate is None or raw_fp is None:
+        return None
+    if info.compress_type != zipfile.ZIP_DEFLATED or info.flag_bits & 0x1:
+        return None
+    if info.file_size == 0 or info.file_size > _LIBDEFLATE_MAX_SIZE:
+        return None
+
+    try:
+        data = _libdeflate.deflate_decompress(_read_raw_member(raw_fp, info), info.file_size)
+    except Exception:
+        # Let zipfile handle (and report) anything unusual.
+        return None
+    if zlib.crc32(data) != info.CRC:
+        raise zipfile.BadZipFile(f"Bad CRC-32 for file {info.filename!r}")
+    return data
+
+
+# Files at least this large get their final size preallocated before writing.
+_PREALLOCATE_MIN_SIZE = 64 * 1024
+
+# macOS fcntl(F_PREALLOCATE) with struct fstore {flags, posmode, offset, length, bytesalloc}.
+_F_PREALLOCATE = 42
+_F_ALLOCATECONTIG = 0x2
+_F_ALLOCATEALL = 0x4
+_F_PEOFPOSMODE = 3
+
+
+def _preallocate(f, size: int) -> None:
+    """
+    Best-effort: reserve `size` bytes for a freshly opened file so the filesystem
+    can allocate it in one go instead of extending it write by write.
+    """
+    if size < _PREALLOCATE_MIN_SIZE:
+        return
+    try:
+        if hasattr(os, "posix_fallocate"):
+            os.posix_fallocate(f.fileno(), 0, size)
+        elif sys.platform == "darwin":
+            import fcntl
+
+            # Try a contiguous allocation first, then any allocation.
+            for flags in (_F_ALLOCATECONTIG | _F_ALLOCATEALL, _F_ALLOCATEALL):
+                try:
+                    fcntl.fcntl(f.fileno(), _F_PREALLOCATE, struct.pack("=Iiqqq", flags, _F_PEOFPOSMODE, 0, size, 0))
+                    break
+                except OSError:
+                    continue
+    except OSError:
+        # Unsupported filesystem etc.; the write still works without it.
+        pass
+
+
+def _stream_member(
+    zip_ref: zipfile.ZipFile,
+    info: zipfile.ZipInfo,
+    dst_dir: Path,
+    raw_fp=None,
+    target: Optional[Path] = None,
+) -> Path:
+    """
+    Inflate one entry straight into its target file with a 1 MiB buffer
+    (the final size, known from the central directory, is preallocated).
+    With `raw_fp` (a separate binary handle on the archive) and libdeflate installed,
+    DEFLATE entries are inflated in a single call instead.
+    `target` overrides the default path below dst_dir; its folder must already exist.
+    """
+    if target is None:
+        target = _member_target(dst_dir, info.filename)
+
+    data = _inflate_with_libdeflate(raw_fp, info)
+    if data is not None:
+        with open(target, "wb") as dst:
+            _preallocate(dst, len(data))
+            dst.write(data)
+        return target
+
+    with zip_ref.open(info) as src, open(target, "wb") as dst:
+        _preallocate(dst, info.file_size)
+        shutil.copyfileobj(src, dst, _COPY_BUFSIZE)
+    return target
+
+
+def _zip_worker_count(n_entries: int) -> int:
+    return max(1, min(32, (os.cpu_count() or 1) * 2, n_entries))
+
+
+# macOS and Windows file systems are case-insensitive by default: "A.pdf" and "a.pdf"
+# land in the same file there.
+_CASE_INSENSITIVE_FS = sys.platform == "darwin" or sys.platform.startswith("win")
+
+
+def _dedupe_targets(infos: List[zipfile.ZipInfo]) -> List[zipfile.ZipInfo]:
+    """
+    One entry per target file: when several entries extract to the same path
+    (duplicate names, or names differing only in case on a case-insensitive file system),
+    only the last one is kept, as sequential extraction would leave it on disk.
+    Archive order is kept otherwise.
+    """
+    last: Dict[str, int] = {}
+    for idx, info in enumerate(infos):
+        key = str(_member_target(Path(), info.filename))
+        last[key.casefold() if _CASE_INSENSITIVE_FS else key] = idx
+    if len(last) == len(infos):
+        return infos
+    keep = set(last.values())
+    return [info for idx, info in enumerate(infos) if idx in keep]
+
+
+def list_zip_members(zip_path: Path) -> List[zipfile.ZipInfo]:
+    """
+    Document entries of a ZIP (central directory only, nothing is extracted),
+    one per target file (see _dedupe_targets()).
+    """
+    with zipfile.ZipFile(zip_path, "r") as zip_ref:
+        return _dedupe_targets([i for i in zip_ref.infolist() if not _should_skip_member(i.filename)])
+
+
+def extract_zip_members(
+    zip_path: Path,
+    dst_dir: Path,
+    progress_cb: Optional[Callable[[str], None]] = None,
+    should_stop: Optional[Callable[[], bool]] = None,
+    *,
+    infos: Optional[List[zipfile.ZipInfo]] = None,
+    on_extracted: Optional[Callable[[Path], None]] = None,
+) -> List[Path]:
+    """
+    Extract all document entries of a ZIP into dst_dir, skipping macOS artifacts.
+
+    Entries are inflated in parallel by a thread pool (zlib releases the GIL) and
+    streamed to disk with a 1 MiB copy buffer, or inflated with libdeflate when the
+    optional `deflate` package is installed.
+    Each worker thread opens its own ZipFile handle, because one ZipFile is not
+    safe for concurrent reads. Returns the extracted file paths in archive order.
+
+    - infos: entries from list_zip_members() (read again if omitted)
+    - on_extracted(path): called in archive order as soon as each file is written,
+      so a consumer can start on it while the rest is still being extracted
+    - should_stop(): when it becomes true, remaining entries are skipped
+    """
+    dst_dir = Path(dst_dir)
+    dst_dir.mkdir(parents=True, exist_ok=True)
+
+    if infos is None:
+        infos = list_zip_members(zip_path)
+    else:
+        # Workers must never write the same file concurrently.
+        infos = _dedupe_targets(infos)
+
+    if not infos:
+        return []
+
+    # Pre-create folders sequentially so workers never race on makedirs.
+    for info in infos:
+        _member_target(dst_dir, info.filename).parent.mkdir(parents=True, exist_ok=True)
+
+    local = threading.local()
+    handles: list = []  # ZipFile / raw file handles, closed at the end
+    handles_lock = threading.Lock()
+
+    def _extract(info: zipfile.ZipInfo) -> Optional[Path]:
+        if should_stop is not None and should_stop():
+            return None
+        zf = getattr(local, "zip_ref", None)
+        if zf is None:
+            zf = zipfile.ZipFile(zip_path, "r")
+            local.zip_ref = zf
+            local.raw_fp = open(zip_path, "rb") if _libdeflate is not None else None
+            with handles_lock:
+                handles.append(zf)
+                if local.raw_fp is not None:
+                    handles.append(local.raw_fp)
+        return _stream_member(zf, info, dst_dir, local.raw_fp)
+
+    total = len(infos)
+    step = max(1, total // 10)
+    out: List[Path] = []
+    try:
+        with ThreadPoolExecutor(max_workers=_zip_worker_count(total)) as pool:
+            for i, path in enumerate(pool.map(_extract, infos), start=1):
+                if path is not None:
+                    out.append(path)
+                    if on_extracted is not None:
+                        on_extracted(path)
+                if progress_cb and (i == total or i % step == 0):
+                    progress_cb(f"Extracted {i}/{total} files")
+    finally:
+        for h in handles:
+            h.close()
+
+    return out
+
+
 def process_zip(zip_path: Path, output_dir: Path = OUTPUT_DIR, output_format: str = "txt"):
     """
     Process a ZIP archive:
@@ -95,89 +357,191 @@ def process_zip(zip_path: Path, output_dir: Path = OUTPUT_DIR, output_format: st
     - classify each file
     - summarize content
     - save .txt and .json summaries
-    - copy original docs to extracted_documents/
+    - keep the original docs in extracted_documents/
     """
-    print(f"Start processing ZIP: {zip_path}")
-
-    # Clear old output summaries
-    for f in output_dir.glob("*_summary.*"):
-        try:
-            f.unlink(missing_ok=True)
-        except Exception:
-            pass
+    from backend.summarizer import summarize_document
 
-    # Clear previously extracted documents
-    _safe_clear_dir(EXTRACTED_DIR)
+    print(f"Start processing ZIP: {zip_path}")
 
-    # Extract ZIP to a temporary folder (filtering macOS artifacts)
-    with tempfile.TemporaryDirectory() as temp_dir:
+    # Clear old output summaries (same names as the "*_summary.*" glob, one readdir)
+    try:
+        with os.scandir(output_dir) as it:
+            for entry in it:
+                if "_summary." in entry.name:
+                    try:
+                        os.unlink(entry.path)
+                    except OSError:
+                        pass
+    except OSError:
+        pass
+
+    # Clear previously extracted documents (deleted in the background)
+    try:
+        discard_dir(EXTRACTED_DIR)
+    except OSError:
+        _safe_clear_dir(EXTRACTED_DIR)
+    EXTRACTED_DIR.mkdir(parents=True, exist_ok=True)
+
+    # Extract straight into extracted_documents/ (flat, filtering macOS artifacts);
+    # files that end up without a summary are removed again below.
+    # With libdeflate, DEFLATE entries are inflated whole in one call (CRC still checked).
+    paths: List[Path] = []
+    raw_fp = open(zip_path, "rb") if _libdeflate is not None else None
+    try:
         with zipfile.ZipFile(zip_path, "r") as zip_ref:
-            extracted_count = 0
             for info in zip_ref.infolist():
                 if _should_skip_member(info.filename):
                     continue
-                zip_ref.extract(info, temp_dir)
-                extracted_count += 1
+                base = info.filename.replace("\\", "/").rpartition("/")[2]
+                target = _unique_target_path(EXTRACTED_DIR, base)
+                paths.append(_stream_member(zip_ref, info, EXTRACTED_DIR, raw_fp, target=target))
+    finally:
+        if raw_fp is not None:
+            raw_fp.close()
+
+    print(f"Archive extracted to: {EXTRACTED_DIR} (files extracted: {len(paths)})")
+
+    # Text extraction + classification of the next files run ahead in a small
+    # worker pool while the LLM summarizes.
+    # (Summaries stay sequential: there is one model instance and it is not reentrant.)
+    # Outputs (and the metadata pass) are written by one background thread while the
+    # next document is summarized; leaving the `with` waits for the last writes.
+    with _prepare_pool(len(paths)) as pool, ThreadPoolExecutor(max_workers=1) as io_pool:
+        pending: deque = deque()
+        next_i = 0
+        while pending or next_i < len(paths):
+            while next_i < len(paths) and len(pending) < _PREPARE_AHEAD:
+                try:
+                    fut = pool.submit(_prepare_document, paths[next_i])
+                except BrokenExecutor:
+                    fut = None
+                pending.append((paths[next_i], fut))
+                next_i += 1
+
+            full_path, fut = pending.popleft()
+            print(f"\nProcessing: {full_path.name}")
+            saved = False
+            try:
+                try:
+                    prepared = fut.result() if fut is not None else _prepare_document(full_path)
+                except BrokenExecutor:
+                    # Worker process died (or could not start): prepare this one here.
+                    prepared = _prepare_document(full_path)
+                if prepared is None:
+                    print("Warning: No text extracted.")
+                    continue
+                text, doc_type = prepared
+                print(f"Document type: {doc_type}")
 
-            print(f"Archive extracted to: {temp_dir} (files extracted: {extracted_count})")
+                # Summarize based on type
+                summary = summarize_document(doc_type, text)
 
-        # Process all files inside the temporary folder
-        for root, _, files in os.walk(temp_dir):
-            # Skip __MACOSX even if it somehow exists on disk
-            if "__MACOSX" in Path(root).parts:
-                continue
+                write = io_pool.submit(_write_outputs, full_path, output_dir, doc_type, text, summary)
+                write.add_done_callback(lambda f, p=full_path: _report_write(p, f))
+                saved = True
 
-            for filename in files:
-                # Skip AppleDouble and other hidden artifacts
-                if filename.startswith("._") or filename == ".DS_Store":
-                    continue
+            except Exception as e:
+                print(f"Error processing {full_path.name}: {e}")
+            finally:
+                if not saved:
+                    # Only summarized documents are kept, as before.
+                    try:
+                        full_path.unlink(missing_ok=True)
+                    except OSError:
+                        pass
 
-                full_path = Path(root) / filename
-                print(f"\nProcessing: {full_path.name}")
 
-                try:
-                    # Extract text from document
-                    text = extract_text(full_path)
-                    if not text:
-                        print("Warning: No text extracted.")
-                        continue
-
-                    # Classify document type
-                    doc_type = classify_document(full_path, text)
-                    print(f"Document type: {doc_type}")
-
-                    # Summarize based on type
-                    summary = summarize_document(doc_type, text)
-
-                    # Prepare output paths
-                    stem = full_path.stem
-                    txt_path = output_dir / f"{stem}_summary.txt"
-                    json_path = output_dir / f"{stem}_summary.json"
-
-                    # Save TXT summary
-                    txt_path.write_text(summary, encoding="utf-8")
-
-                    # Save JSON summary with metadata
-                    json_data = {
-                        "filename": full_path.name,
-                        "doc_type": doc_type,
-                        "workflow": guess_workflow(doc_type),
-                        "summary": summary,
-                        "meta": extract_basic_meta(text),
-                    }
-                    json_path.write_text(
-                        json.dumps(json_data, indent=2, ensure_ascii=False),
-                        encoding="utf-8",
-                    )
-
-                    # Save a copy of the original file (avoid collisions)
-                    extracted_copy_path = _unique_target_path(EXTRACTED_DIR, full_path.name)
-                    shutil.copy2(full_path, extracted_copy_path)
-
-                    print(f"Saved: {txt_path.name} and {json_path.name}")
-
-                except Exception as e:
-                    print(f"Error processing {full_path.name}: {e}")
+# process_zip(): documents prepared (text + type) ahead of the one being summarized.
+_PREPARE_WORKERS = max(1, min(4, os.cpu_count() or 1))
+_PREPARE_AHEAD = _PREPARE_WORKERS * 2
+# From this many documents on, preparation runs in worker processes: PDF/DOCX parsing
+# is pure Python and holds the GIL. Smaller archives don't pay the process start-up.
+_PREPARE_PROCESS_MIN = 8
+
+
+def spawn_process_pool(max_workers: int) -> ProcessPoolExecutor:
+    """
+    Process pool for the document workers (process_zip, ClassificationWorker).
+    Always "spawn": fork is unsafe with Qt/threads and the default on macOS anyway.
+    Callers fall back to in-process work when submit() or result() raises BrokenExecutor.
+    """
+    return ProcessPoolExecutor(max_workers=max_workers, mp_context=multiprocessing.get_context("spawn"))
+
+
+def _prepare_pool(n_docs: int) -> Executor:
+    if n_docs >= _PREPARE_PROCESS_MIN and _PREPARE_WORKERS > 1:
+        return spawn_process_pool(_PREPARE_WORKERS)
+    return ThreadPoolExecutor(max_workers=_PREPARE_WORKERS)
+
+
+def _prepare_document(full_path: Path) -> Optional[Tuple[str, str]]:
+    """
+    (text, doc_type) of one extracted file, or None when it has no text.
+    """
+    from backend.text_extraction import extract_text
+    from backend.classifiers import classify_document
+
+    text = extract_text(full_path)
+    if not text:
+        return None
+    return text, classify_document(full_path, text)
+
+
+def dump_summary_json(data: dict, *, compact: bool = False) -> bytes:
+    """
+    UTF-8 JSON (2-space indent, non-ASCII kept as is) for a *_summary.json file.
+    compact=True drops all optional whitespace.
+    """
+    if _orjson is not None:
+        try:
+            return _orjson.dumps(data) if compact else _orjson.dumps(data, option=_orjson.OPT_INDENT_2)
+        except TypeError:
+            # Something orjson cannot encode; the stdlib path reports it properly.
+            pass
+    if compact:
+        return json.dumps(data, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+    return json.dumps(data, indent=2, ensure_ascii=False).encode("utf-8")
+
+
+def _write_outputs(full_path: Path, output_dir: Path, doc_type: str, text: str, summary: str) -> Tuple[Path, Path]:
+    """
+    Save the .txt and .json summary (the original already sits in EXTRACTED_DIR).
+    """
+    stem = full_path.stem
+    txt_path = output_dir / f"{stem}_summary.txt"
+    json_path = output_dir / f"{stem}_summary.json"
+
+    # Save TXT summary
+    txt_path.write_text(summary, encoding="utf-8")
+
+    # Save JSON summary with metadata
+    json_data = {
+        "filename": full_path.name,
+        "doc_type": doc_type,
+        "workflow": guess_workflow(doc_type),
+        "summary": summary,
+        "meta": extract_basic_meta(text),
+    }
+    json_path.write_bytes(dump_summary_json(json_data))
+
+    return txt_path, json_path
+
+
+def _report_write(full_path: Path, fut) -> None:
+    """
+    Done-callback of a background _write_outputs(): log it, and on failure drop the
+    original like any other document that ends up without a summary.
+    """
+    try:
+        txt_path, json_path = fut.result()
+    except Exception as e:
+        print(f"Error processing {full_path.name}: {e}")
+        try:
+            full_path.unlink(missing_ok=True)
+        except OSError:
+            pass
+        return
+    print(f"Saved: {txt_path.name} and {json_path.name}")
 
 
 def guess_workflow(doc_type: str) -> str:
@@ -194,26 +558,35 @@ def guess_workflow(doc_type: str) -> str:
     return mapping.get(doc_type, "Standaard Samenvatting")
 
 
+# Metadata fields for extract_basic_meta(), found in a single pass over the text.
+# Each field sits in a lookahead, so matches never consume text another field needs
+# (e.g. "Verdachte: X, Geboortedatum: ..." on one line); the first hit per field wins,
+# exactly like a separate re.search() per field.
+_RE_META = re.compile(
+    r"(?=(?:Verdachte|Betrokkene|Persoon):?\s*(?P<verdachte>.+)"
+    r"|Geboortedatum:?\s*(?P<geboortedatum>[\d\-\.]{8,12})"
+    r"|Delict:?\s*(?P<delict>.+?)(?:\n|$)"
+    r"|Advies:?\s*(?P<advies>.+?)(?:\n|$)"
+    r"|Risico(?:-inschatting)?:?\s*(?P<risico>Hoog|Midden|Laag))",
+    re.IGNORECASE,
+)
+_META_FIELDS = ("verdachte", "geboortedatum", "delict", "advies", "risico")
+
+
 def extract_basic_meta(text: str) -> dict:
     """
     Very simple rule-based metadata extraction.
     Can be replaced by an LLM later if needed.
     """
-    meta = {}
-
-    m = re.search(r"(?:Verdachte|Betrokkene|Persoon):?\s*(.+)", text, re.IGNORECASE)
-    meta["verdachte"] = m.group(1).strip() if m else ""
-
-    m = re.search(r"Geboortedatum:?\s*([\d\-\.]{8,12})", text, re.IGNORECASE)
-    meta["geboortedatum"] = m.group(1).strip() if m else ""
-
-    m = re.search(r"Delict:?\s*(.+?)(?:\n|$)", text, re.IGNORECASE)
-    meta["delict"] = m.group(1).strip() if m else ""
-
-    m = re.search(r"Advies:?\s*(.+?)(?:\n|$)", text, re.IGNORECASE)
-    meta["advies"] = m.group(1).strip() if m else ""
-
-    m = re.search(r"Risico(?:-inschatting)?:?\s*(Hoog|Midden|Laag)", text, re.IGNORECASE)
-    meta["risico"] = m.group(1).capitalize() if m else ""
-
+    found = {}
+    for m in _RE_META.finditer(text):
+        field = m.lastgroup
+        if field not in found:
+            found[field] = m.group(field)
+            if len(found) == len(_META_FIELDS):
+                break
+
+    meta = {field: (found[field].strip() if field in found else "") for field in _META_FIELDS}
+    if meta["risico"]:
+        meta["risico"] = meta["risico"].capitalize()
     return meta
@@ -4,12 +4,27 @@
 from __future__ import annotations
 
 import json
+import os
+import shutil
+import threading
 import uuid
 from dataclasses import dataclass, field, asdict
 from datetime import datetime
 from pathlib import Path
 from typing import Any, Dict, List, Optional
 
+try:
+    # orjson: faster manifest encode/decode; the stdlib json is the fallback.
+    import orjson as _orjson
+except ImportError:
+    _orjson = None
+
+try:
+    # msgspec: encodes/decodes the dataclasses below directly, without the to_dict()/from_dict() walk.
+    import msgspec as _msgspec
+except ImportError:
+    _msgspec = None
+
 
 # -----------------------------
 # Enums / constants (simple strings to keep JSON easy)
@@ -49,6 +64,66 @@ def _path_str(p: Optional[Path]) -> Optional[str]:
     return str(p)
 
 
+def _msgspec_enc_hook(obj: Any) -> Any:
+    if isinstance(obj, Path):
+        return str(obj)
+    raise NotImplementedError(f"Cannot encode {type(obj).__name__}")
+
+
+def _msgspec_dec_hook(tp: Any, obj: Any) -> Any:
+    if tp is Path and isinstance(obj, str):
+        return Path(obj)
+    raise NotImplementedError(f"Cannot decode {tp}")
+
+
+# Infix of the hidden folders discard_dir() renames a tree to before deleting it.
+_TRASH_MARKER = ".trash-"
+
+
+def discard_dir(path: Path) -> None:
+    """
+    Remove a directory tree without blocking the caller.
+
+    The folder is renamed to a hidden sibling (".<name>.trash-<id>", an O(1) metadata
+    operation) and deleted by a daemon thread. Raises OSError if the rename fails,
+    e.g. when a file inside is locked.
+    """
+    path = Path(path)
+    if not path.exists():
+        return
+
+    trash = path.with_name(f".{path.name}{_TRASH_MARKER}{uuid.uuid4().hex[:8]}")
+    path.rename(trash)
+    threading.Thread(target=shutil.rmtree, args=(trash,), kwargs={"ignore_errors": True}, daemon=True).start()
+
+
+def sweep_discarded_dirs(parent: Path) -> None:
+    """
+    Delete leftovers of discard_dir() directly under parent (in the background).
+
+    The daemon thread of discard_dir() dies with the app, so a quit mid-delete leaves
+    a hidden ".<name>.trash-<id>" folder (e.g. with case documents) behind; call this
+    at startup to finish those deletions.
+    """
+    try:
+        with os.scandir(parent) as it:
+            leftovers = [
+                e.path
+                for e in it
+                if e.name.startswith(".") and _TRASH_MARKER in e.name and e.is_dir(follow_symlinks=False)
+            ]
+    except OSError:
+        return
+    if not leftovers:
+        return
+
+    def _remove_all() -> None:
+        for p in leftovers:
+            shutil.rmtree(p, ignore_errors=True)
+
+    threading.Thread(target=_remove_all, daemon=True).start()
+
+
 def new_case_id() -> str:
     # Human-readable case id + short UUID suffix for uniqueness.
     ts = datetime.now().strftime("%Y-%m-%d_%H%M%S")
@@ -405,14 +480,33 @@ class AppState:
             raise RuntimeError("Cannot save manifest: case_dir is not initialized.")
         self.ensure_case_dirs()
         self.touch()
-        with mp.open("w", encoding="utf-8") as f:
-            json.dump(self.to_dict(), f, ensure_ascii=False, indent=2)
+        if _msgspec is not None:
+            raw = _msgspec.json.encode(self, enc_hook=_msgspec_enc_hook)
+            mp.write_bytes(_msgspec.json.format(raw, indent=2))
+            return mp
+        data = self.to_dict()
+        if _orjson is not None:
+            mp.write_bytes(_orjson.dumps(data, option=_orjson.OPT_INDENT_2))
+        else:
+            with mp.open("w", encoding="utf-8") as f:
+                json.dump(data, f, ensure_ascii=False, indent=2)
         return mp
 
     @staticmethod
     def load_manifest(manifest_path: Path) -> "AppState":
-        with manifest_path.open("r", encoding="utf-8") as f:
-            data = json.load(f)
-        state = AppState.from_dict(data)
+        raw = manifest_path.read_bytes()
+        state = None
+        if _msgspec is not None:
+            try:
+                state = _msgspec.json.decode(raw, type=AppState, dec_hook=_msgspec_dec_hook)
+            except _msgspec.ValidationError:
+                # Older/hand-edited manifest: the lenient from_dict() path below handles it.
+                state = None
+        if state is None:
+            if _orjson is not None:
+                data = _orjson.loads(raw)
+            else:
+                data = json.loads(raw.decode("utf-8"))
+            state = AppState.from_dict(data)
         state.ensure_case_dirs()
         return state
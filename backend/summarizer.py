@@ -1,77 +1,159 @@
 # backend/summarizer.py
 
 from __future__ import annotations
+from functools import lru_cache
 from pathlib import Path
-from typing import List, Optional
+from typing import Iterator, List, Optional, Tuple
+import os
+import platform
 import re
+import sys
+import threading
 
-from ctransformers import AutoModelForCausalLM
+try:
+    # llama-cpp-python: актуальний llama.cpp (Metal на Apple Silicon); якщо встановлено — основний бекенд
+    from llama_cpp import Llama
+except ImportError:
+    Llama = None
+try:
+    from ctransformers import AutoModelForCausalLM
+except ImportError:
+    AutoModelForCausalLM = None
 from backend.config import (
-    PROMPT_FILES,
+    get_prompt,
     MAX_CHARS_PER_CHUNK,
     MODEL_PATH,
+    MODEL_TYPE,
     N_CTX,
+    USE_MLOCK,
     MAX_NEW_TOKENS,
     AGGREGATE_GROUP_SIZE,
     AGGREGATE_MAX_PARTIALS,
+    AGGREGATE_MIN_PARTIALS,
 )
 
 # === Глобальні змінні =========================================================
 GPU_LAYERS = 20  # скільки шарів гнати на GPU; потім можна збільшити до 30–35
 
+# Apple Silicon: layers are offloaded to Metal (ctransformers Metal build; CPU builds ignore it).
+USE_METAL = sys.platform == "darwin" and platform.machine() == "arm64"
+
 _llm = None
+_llm_lock = threading.Lock()  # get_llm(): only one thread loads the model
+_gen_lock = threading.Lock()  # _generate(): одна модель, один KV-кеш — генерації по черзі
 _effective_ctx = int(N_CTX)   # фактичний ліміт контексту; за замовчуванням беремо N_CTX
 
+# Бекенд перевіряє ці рядки після кожного токена (одна скомпільована регулярка плюс
+# пошук часткового збігу в кінці тексту), тож список тримаємо мінімальним:
+# "JOUW ANTWOORD:" не потрібен — "JOUW ANTWOORD" спрацьовує в тій самій позиції.
 STOP_WORDS = [
     "<|user|>", "<|system|>",
     "</TEKST>", "</TEKST_WAAR_HET_OM_GAAT>",
-    "JOUW ANTWOORD:", "JOUW ANTWOORD",
+    "JOUW ANTWOORD",
     "[TEKST_OM_SAMEN_TE_VATTEN]",
 ]
 
+# Регулярки компілюємо один раз при імпорті
+# _sanitize: спершу "Pagina X van Y", потім рядки "Retouradres" (окремим проходом:
+# після видалення маркера сторінки "Retouradres" може опинитись на початку рядка),
+# і лише тоді згортаємо зайві порожні рядки (і ті, що лишились після видалення)
+_RE_PAGINA = re.compile(r"(?i)Pagina\s+\d+\s+van\s+\d+\s*")
+_RE_RETOUR = re.compile(r"(?im)^\s*Retouradres.*$")
+_RE_MANY_NL = re.compile(r"\n{3,}")
+_RE_OVERWEGENDE = re.compile(r"(?i)\bOverwegende\b")
+_RE_ECHO_LINE = re.compile(r"(?i)^\s*je bent.*?\n")
+_RE_ECHO_REPEAT = re.compile(r"(?i)(\bje bent\b[\s,;:.!?]*){2,}")
+
 # === Завантаження моделі (БЕЗ config=dict) ===================================
 def get_llm():
     """
-    Завантажує TinyLlama через ctransformers.
+    Завантажує TinyLlama через llama-cpp-python (якщо встановлено), інакше через ctransformers.
     - НЕ використовуємо параметр config=..., щоб уникнути помилки 'dict has no attribute config'.
     - Передаємо context_length як ТОР-РІВНЕВИЙ kwargs (як підтримує ctransformers).
     """
     global _llm
     if _llm is not None:
         return _llm
+    with _llm_lock:
+        if _llm is None:
+            _llm = _load_llm()
+    return _llm
 
+def warm_up_llm() -> None:
+    """
+    Фонове завантаження моделі (з вікна справи, коли є документи в черзі): ваги
+    читаються, поки вікно відкривається, і перший summarize_document уже не чекає.
+    Якщо моделі ще нема (перший запуск, download) — нічого не робимо.
+    """
+    try:
+        if Path(str(MODEL_PATH)).exists():
+            get_llm()
+    except Exception as e:
+        # Помилку покаже перший реальний виклик get_llm()
+        print(f"[summarizer] warm-up skipped: {e}")
+
+def _load_llm():
     mp = Path(str(MODEL_PATH))
     if not mp.exists():
         raise FileNotFoundError(f"LLM model not found: {mp}")
 
+    if Llama is not None and mp.is_file():
+        llm = Llama(
+            model_path=str(mp),
+            n_ctx=int(N_CTX),
+            n_gpu_layers=-1 if USE_METAL else 0,  # -1: усі шари на Metal
+            n_threads=max(1, (os.cpu_count() or 2) // 2),
+            use_mlock=USE_MLOCK,
+            verbose=False,
+        )
+        print(f"[summarizer] model loaded (llama.cpp), n_ctx={int(N_CTX)}")
+        return llm
+
+    if AutoModelForCausalLM is None:
+        raise RuntimeError("Neither llama_cpp nor ctransformers is available in this environment.")
+
     if mp.is_file():
-        _llm = AutoModelForCausalLM.from_pretrained(
+        llm = AutoModelForCausalLM.from_pretrained(
             str(mp.parent),               # model_path_or_repo_id (папка)
             model_file=mp.name,           # ім’я .gguf
-            model_type="mistral",
-            gpu_layers=0,
+            model_type=MODEL_TYPE,
+            gpu_layers=GPU_LAYERS if USE_METAL else 0,
             context_length=int(N_CTX),    # <-- безпечно для нових/старих збірок
         )
     else:
-        _llm = AutoModelForCausalLM.from_pretrained(
+        llm = AutoModelForCausalLM.from_pretrained(
             str(mp),                      # папка з .gguf
-            model_type="mistral",
-            gpu_layers=GPU_LAYERS,
+            model_type=MODEL_TYPE,
+            gpu_layers=GPU_LAYERS if USE_METAL else 0,
             context_length=int(N_CTX),
         )
     print(f"[summarizer] model loaded, requested context_length={int(N_CTX)}")
-    return _llm
+    return llm
 
 # === Утиліти ==================================================================
 def _count_tokens_rough(s: str) -> int:
     # ~1 токен / 3.6 символа для LLaMA-подібних
-    return max(1, int(len(s) / 3.6))
+    return _count_tokens_rough_len(len(s))
+
+def _count_tokens_rough_len(n_chars: int) -> int:
+    return max(1, int(n_chars / 3.6))
+
+# Нижня межа, щоб коротка відповідь на 4 речення не обривалась посередині
+_MIN_NEW_TOKENS = 64
+
+def _max_new_for(body: str) -> int:
+    """
+    Ліміт генерації під довжину вхідного тексту: ~третина його токенів,
+    у межах [_MIN_NEW_TOKENS, MAX_NEW_TOKENS]. Декодування — найповільніша фаза,
+    тож короткі шматки не повинні отримувати повний бюджет.
+    """
+    return max(_MIN_NEW_TOKENS, min(int(MAX_NEW_TOKENS), _count_tokens_rough(body) // 3))
 
 def _sanitize(s: str) -> str:
     s = (s or "").replace("\r\n", "\n")
-    s = re.sub(r"\n{3,}", "\n\n", s)
-    s = re.sub(r"(?i)Pagina\s+\d+\s+van\s+\d+\s*", "", s)
-    s = re.sub(r"(?im)^\s*Retouradres.*$", "", s)
+    s = _RE_PAGINA.sub("", s)
+    s = _RE_RETOUR.sub("", s)
+    s = _RE_MANY_NL.sub("\n\n", s)
     # прибираємо зайві ** із PDF-екстракції
     s = s.replace("**", "")
     return s.strip()
@@ -80,79 +162,160 @@ def _chatml(system_msg: str, user_msg: str) -> str:
     # Лаконічна system-роль, щоб не провокувати ехо "Je bent..."
     return f"<|system|>\n{system_msg}\n<|user|>\n{user_msg}\n<|assistant|>\n"
 
-def _chunk(text: str, max_chars: int) -> List[str]:
+def _chunk(text: str, max_chars: int, max_chunks: Optional[int] = None) -> Iterator[str]:
+    """
+    Шматки видаються по одному: MAP обробляє шматок і відпускає його,
+    в пам'яті не тримаємо список усіх копій.
+    """
     t = (text or "").strip()
     if not t:
-        return []
-    out: List[str] = []
+        return
+    count = 0
     i, n = 0, len(t)
-    while i < n:
-        piece = t[i : i + max_chars]
-        j = piece.rfind("\n")
-        if j > int(max_chars * 0.6):
-            piece = piece[:j]
-        out.append(piece.strip())
-        i += len(piece)
-    return out
+    min_cut = int(max_chars * 0.6)
+    while i < n and (max_chunks is None or count < max_chunks):
+        end = min(i + max_chars, n)
+        if end < n:
+            # rfind у межах [i, end) — без проміжної копії шматка;
+            # спершу межа абзацу, потім будь-який перенос рядка
+            j = t.rfind("\n\n", i, end)
+            if j - i <= min_cut:
+                j = t.rfind("\n", i, end)
+            if j - i > min_cut:
+                end = j
+        yield t[i:end].strip()
+        count += 1
+        i = end
 
 def _load_template(doc_type: str) -> str:
-    path = PROMPT_FILES.get(doc_type.upper()) or PROMPT_FILES["UNKNOWN"]
-    return Path(path).read_text(encoding="utf-8")
-
-def _wrap_user(template: str, body: str, max_sents: int = 4) -> str:
-    return (
-        template.strip()
-        + "\n[TEKST]\n"
-        + (body or "").strip()
-        + "\n</TEKST>\n"
-        + f"Geef maximaal {max_sents} zinnen."
-    )
+    return get_prompt(doc_type)
+
+_CHUNK_SAFETY_TOKENS = 64
+# Консервативна оцінка символів на токен, якщо токенізатор недоступний
+# (юридичні тексти нідерландською — ~3.0–3.2, а не 3.6)
+_CHARS_PER_TOKEN_SAFE = 3.0
+# Скільки тексту токенізуємо, щоб виміряти щільність токенів документа
+_RATIO_SAMPLE_CHARS = 8000
+
+@lru_cache(maxsize=16)
+def _prompt_parts(system_msg: str, template: str) -> Tuple[str, str]:
+    # Незмінні частини ChatML-промпту (system + шаблон / кінець) — один раз на шаблон;
+    # промпт шматка — лише join(prefix, body, suffix)
+    prefix = f"<|system|>\n{system_msg}\n<|user|>\n" + template.strip() + "\n[TEKST]\n"
+    suffix = "\n</TEKST>\nGeef maximaal 4 zinnen.\n<|assistant|>\n"
+    return prefix, suffix
+
+def _max_body_chars(fixed_len: int, target_ctx: int) -> int:
+    # 90% від ліміту — запас на службові токени.
+    # _count_tokens_rough лінійна за довжиною, тож максимальну довжину body
+    # рахуємо одразу; менше ~200 символів не ріжемо.
+    limit = max(256, int(target_ctx * 0.90))
+    return max(199, int((limit + 1) * 3.6) - fixed_len - 1)
+
+def _count_tokens(llm, s: str) -> int:
+    # Справжній токенізатор моделі (llama.cpp приймає bytes, ctransformers — str)
+    if Llama is not None and isinstance(llm, Llama):
+        return len(llm.tokenize(s.encode("utf-8"), add_bos=False))
+    return len(llm.tokenize(s))
+
+def _chunk_chars(system_msg: str, template: str, target_ctx: int, text: str = "") -> int:
+    """
+    Розмір шматка (символи), що заповнює контекст:
+    target_ctx - токени шаблону - MAX_NEW_TOKENS - запас.
+    Токени рахує токенізатор моделі; символи на токен міряються на початку
+    самого тексту (з 10% запасом), без моделі — _CHARS_PER_TOKEN_SAFE.
+    Не більше, ніж _fit_prompt_to_ctx пропустить без обрізання;
+    MAX_CHARS_PER_CHUNK > 0 — додаткова верхня межа.
+    """
+    prefix, suffix = _prompt_parts(system_msg, template)
+    fixed_len = len(prefix) + len(suffix)
+    ratio = _CHARS_PER_TOKEN_SAFE
+    fixed_tokens = int(fixed_len / ratio) + 1
+    sample = text[:_RATIO_SAMPLE_CHARS]
+    try:
+        llm = get_llm()
+        fixed_tokens = _count_tokens(llm, prefix) + _count_tokens(llm, suffix)
+        n_sample = _count_tokens(llm, sample) if sample else 0
+        if n_sample:
+            ratio = min(3.6, len(sample) / n_sample) * 0.9
+    except Exception:
+        pass
+    budget = target_ctx - fixed_tokens - MAX_NEW_TOKENS - _CHUNK_SAFETY_TOKENS
+    n = min(int(budget * ratio), _max_body_chars(fixed_len, target_ctx))
+    if MAX_CHARS_PER_CHUNK > 0:
+        n = min(n, MAX_CHARS_PER_CHUNK)
+    return max(200, n)
 
 def _fit_prompt_to_ctx(system_msg: str, template: str, body: str, target_ctx: int) -> str:
     """
-    Будує ChatML і, якщо довго, поступово ріже body під target_ctx.
+    Будує ChatML і, якщо довго, ріже body під target_ctx.
     """
     ch = (body or "").strip()
-    # 90% від ліміту — запас на службові токени
-    limit = max(256, int(target_ctx * 0.90))
-    while True:
-        user_msg = _wrap_user(template, ch, max_sents=4)
-        prompt = _chatml(system_msg, user_msg)
-        if _count_tokens_rough(prompt) <= limit or len(ch) < 200:
-            return prompt
-        ch = ch[: int(len(ch) * 0.85)]  # зменшуємо на 15%
+    prefix, suffix = _prompt_parts(system_msg, template)
+    fixed_len = len(prefix) + len(suffix)
+    if _count_tokens_rough_len(fixed_len + len(ch)) > max(256, int(target_ctx * 0.90)):
+        ch = ch[:_max_body_chars(fixed_len, target_ctx)].strip()
+    return "".join((prefix, ch, suffix))
+
+_REDUCE_HEAD = "Vat de volgende deelsamenvattingen samen tot één tekst van max. 4 zinnen.\n\n"
+_REDUCE_HEAD_SHORT = "Vat kort samen (max. 3 zinnen):\n\n"
 
 def _reduce_group(summaries: List[str], system_msg: str, target_ctx: int) -> str:
-    user = (
-        "Vat de volgende deelsamenvattingen samen tot één tekst van max. 4 zinnen.\n\n"
-        + "\n\n".join(f"— {i+1}. {t}" for i, t in enumerate(summaries))
-    )
-    prompt = _chatml(system_msg, user)
-    if _count_tokens_rough(prompt) > int(target_ctx * 0.90):
-        summaries = summaries[: max(1, len(summaries) // 2)]
-        user = "Vat kort samen (max. 3 zinnen):\n\n" + "\n\n".join(summaries)
-        prompt = _chatml(system_msg, user)
-    return _generate(prompt).strip()
+    limit = int(target_ctx * 0.90)
+    items = [f"— {i+1}. {t}" for i, t in enumerate(summaries)]
+    # Довжину промпту рахуємо до збирання рядка (оцінка токенів лінійна за довжиною)
+    fixed = len(_chatml(system_msg, ""))
+    full_len = fixed + len(_REDUCE_HEAD) + sum(map(len, items)) + 2 * (len(items) - 1)
+    if _count_tokens_rough_len(full_len) <= limit:
+        user = _REDUCE_HEAD + "\n\n".join(items)
+    else:
+        # Беремо стільки часткових, скільки влазить (мінімум одне), одразу, без перебудов
+        used = fixed + len(_REDUCE_HEAD_SHORT)
+        n_keep = 0
+        for t in summaries:
+            used += len(t) + (2 if n_keep else 0)
+            if n_keep and _count_tokens_rough_len(used) > limit:
+                break
+            n_keep += 1
+        user = _REDUCE_HEAD_SHORT + "\n\n".join(summaries[:n_keep])
+    return _generate(_chatml(system_msg, user)).strip()
 
 def _clean_echo(txt: str) -> str:
     t = (txt or "").strip()
+    # Зазвичай ехо немає — тоді обидві регулярки нічого б не змінили
+    if "je bent" not in t.lower():
+        return t
     # прибрати рядки, що починаються із системної інструкції
-    t = re.sub(r"(?i)^\s*je bent.*?\n", "", t)
+    t = _RE_ECHO_LINE.sub("", t)
     # згорнути надмірні повтори "je bent ..."
-    t = re.sub(r"(?i)(\bje bent\b[\s,;:.!?]*){2,}", "Je bent ", t)
+    t = _RE_ECHO_REPEAT.sub("Je bent ", t)
     return t.strip()
 
 # === Генерація ================================================================
 def _generate(prompt: str, *, max_new: Optional[int] = None) -> str:
+    # Обидва бекенди самі пропускають токени, що збігаються з початком попереднього
+    # контексту: спільний префікс system + шаблон у MAP-циклі не перераховується.
+    # Тому префікс має лишатися байт-в-байт однаковим (_fit_prompt_to_ctx).
     llm = get_llm()
-    return llm(
-        prompt,
-        max_new_tokens=int(max_new or MAX_NEW_TOKENS),
-        temperature=0.2,
-        top_p=0.9,
-        repetition_penalty=1.15,
-        stop=STOP_WORDS,
-    )
+    with _gen_lock:
+        if Llama is not None and isinstance(llm, Llama):
+            out = llm(
+                prompt,
+                max_tokens=int(max_new or MAX_NEW_TOKENS),
+                temperature=0.2,
+                top_p=0.9,
+                repeat_penalty=1.15,
+                stop=STOP_WORDS,
+            )
+            return out["choices"][0]["text"]
+        return llm(
+            prompt,
+            max_new_tokens=int(max_new or MAX_NEW_TOKENS),
+            temperature=0.2,
+            top_p=0.9,
+            repetition_penalty=1.15,
+            stop=STOP_WORDS,
+        )
 
 # === Публічний інтерфейс ======================================================
 def summarize_document(
@@ -174,30 +337,31 @@ def summarize_document(
 
     # Спец-обрізання для TLL: відкинути все після "Overwegende"
     if doc_type.upper() == "TLL":
-        m = re.search(r"(?i)\bOverwegende\b", text)
+        m = _RE_OVERWEGENDE.search(text)
         if m:
             text = text[:m.start()].strip()
 
-    chunks = _chunk(text, MAX_CHARS_PER_CHUNK)
-    if not chunks:
-        return "Geen tekst aangetroffen."
-
     # Лаконічна system-роль, щоб не ехо-копіювалась
     system_msg = "Schrijf een korte, professionele samenvatting in het Nederlands."
 
     target_ctx = int(_effective_ctx)  # на старті — те, що вказано у config.py
 
+    # Розмір шматка — від бюджету контексту, а не фіксовані символи: менше шматків,
+    # менше викликів LLM. У фінал іде не більше AGGREGATE_MAX_PARTIALS часткових —
+    # решту шматків не ріжемо і не генеруємо взагалі
+    chunks = _chunk(text, _chunk_chars(system_msg, template, target_ctx, text), max_chunks=AGGREGATE_MAX_PARTIALS)
+
     # --- 1) MAP ---
     partials: List[str] = []
     for ch in chunks:
         # будуємо промпт під поточний target_ctx
         prompt = _fit_prompt_to_ctx(system_msg, template, ch, target_ctx)
         try:
-            out = _generate(prompt).strip()
+            out = _generate(prompt, max_new=_max_new_for(ch)).strip()
         except Exception as e:
             # Якщо збірка реально на 512/1024 — пробуємо авто-фолбек
             msg = str(e)
-            if "maximum context length" in msg or "exceeded maximum context length" in msg:
+            if "maximum context length" in msg or "context window" in msg:
                 if "512" in msg:
                     target_ctx = _effective_ctx = 512
                 elif "1024" in msg:
@@ -205,16 +369,17 @@ def summarize_document(
                 else:
                     target_ctx = _effective_ctx = 768
                 prompt = _fit_prompt_to_ctx(system_msg, template, ch, target_ctx)
-                out = _generate(prompt, max_new=min(140, MAX_NEW_TOKENS)).strip()
+                out = _generate(prompt, max_new=min(140, _max_new_for(ch))).strip()
             else:
                 raise
         partials.append(_clean_echo(out))
-
-    # обрізаємо кількість часткових у фіналі — гарантія, що все влізе
-    if len(partials) > AGGREGATE_MAX_PARTIALS:
-        partials = partials[:AGGREGATE_MAX_PARTIALS]
+    if not partials:
+        return "Geen tekst aangetroffen."
 
     # --- 2) REDUCE (ієрархічно) ---
+    # Кілька часткових просто склеюємо — окремий LLM-прохід лише від AGGREGATE_MIN_PARTIALS
+    if len(partials) < AGGREGATE_MIN_PARTIALS:
+        return "\n\n".join(p for p in partials if p)
     while len(partials) > 1:
         grouped: List[str] = []
         for i in range(0, len(partials), AGGREGATE_GROUP_SIZE):
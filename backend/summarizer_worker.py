@@ -2,24 +2,43 @@
 
 from __future__ import annotations
 
-import json
+import os
+import queue
+import re
 import shutil
+import tempfile
 import threading
+import zipfile
+from concurrent.futures import BrokenExecutor, Future, ProcessPoolExecutor, ThreadPoolExecutor
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Dict, Iterator, List, Optional
 
 from PyQt5.QtCore import QThread, pyqtSignal
 
-from backend.classifiers import classify_document
-from backend.process_zip import extract_basic_meta, guess_workflow
+from backend.classification_cache import ClassificationCache, file_sha256
+from backend.classifiers import classify_document, classify_documents
+from backend.process_zip import (
+    dump_summary_json,
+    extract_basic_meta,
+    extract_zip_members,
+    guess_workflow,
+    list_zip_members,
+    spawn_process_pool,
+)
 from backend.summarizer import summarize_document
-from backend.text_extraction import extract_text
+from backend.text_extraction import extract_text, is_supported_document
 from backend.model_manager import ensure_model_ready
 from backend.config import MODEL_PATH
 
 
-# Global lock to avoid concurrent model download/init/inference across QThreads.
-_LLM_JOB_LOCK = threading.Lock()
+# Global lock to avoid concurrent model download across QThreads.
+# Inference itself is serialized per generate() call inside backend.summarizer,
+# so extraction, pre/post-processing and writes of other jobs are not blocked.
+_MODEL_READY_LOCK = threading.Lock()
+
+
+# __MACOSX as any path component, or a file named ._* (AppleDouble) / .DS_Store.
+_MACOS_ARTIFACT_RE = re.compile(r"(?:^|[\\/])(?:__MACOSX(?:[\\/]|$)|\._[^\\/]*$|\.DS_Store$)")
 
 
 def _is_macos_zip_artifact(path: Path) -> bool:
@@ -29,19 +48,45 @@ def _is_macos_zip_artifact(path: Path) -> bool:
     - AppleDouble files (._filename)
     - .DS_Store
     """
+    return _MACOS_ARTIFACT_RE.search(os.fspath(path)) is not None
+
+
+def _write_atomic(path: Path, data: bytes) -> None:
+    """
+    Write data to a hidden temp file next to path, then rename it into place:
+    readers (report generation, the UI) never see a half-written summary.
+    """
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
     try:
-        if "__MACOSX" in path.parts:
-            return True
-    except Exception:
-        pass
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+        raise
 
-    name = path.name
-    if name == ".DS_Store":
-        return True
-    if name.startswith("._"):
-        return True
 
-    return False
+def _safe_sha256(path: Path) -> Optional[str]:
+    try:
+        return file_sha256(path)
+    except OSError:
+        return None
+
+
+def extract_text_cached(path: Path, cache: Optional[ClassificationCache] = None) -> Optional[str]:
+    """
+    extract_text(), served from the classification cache when a file with the same
+    contents and name was classified before (hashing is far cheaper than parsing).
+    """
+    if cache is not None:
+        sha = _safe_sha256(path)
+        entry = cache.get(sha, path.name) if sha else None
+        if entry is not None and entry.get("text"):
+            return entry["text"]
+    return extract_text(path)
 
 
 def _is_model_present() -> bool:
@@ -55,114 +100,394 @@ def _is_model_present() -> bool:
         return False
 
 
+class ExtractionWorker(QThread):
+    """
+    Stage 0: Extract the ZIP into the case folder (off the GUI thread).
+
+    With `out_queue`, every extracted path is put on the queue right away and a
+    final None marks the end, so ClassificationWorker can run concurrently.
+    """
+
+    progress = pyqtSignal(str)
+    total = pyqtSignal(int)  # number of document entries, known before extraction
+    finished = pyqtSignal(list)  # List[Path]
+    error = pyqtSignal(str)
+
+    def __init__(
+        self,
+        zip_path: Path,
+        extracted_dir: Path,
+        out_queue: Optional["queue.Queue[Optional[Path]]"] = None,
+        infos: Optional[List[zipfile.ZipInfo]] = None,
+    ):
+        super().__init__()
+        self.zip_path = Path(zip_path)
+        self.extracted_dir = Path(extracted_dir)
+        self.out_queue = out_queue
+        # Entries already listed by the caller (list_zip_members); read here otherwise.
+        self.infos = infos
+
+    def run(self):
+        try:
+            infos = self.infos if self.infos is not None else list_zip_members(self.zip_path)
+            self.total.emit(len(infos))
+
+            files = extract_zip_members(
+                self.zip_path,
+                self.extracted_dir,
+                progress_cb=lambda m: self.progress.emit(m),
+                should_stop=self.isInterruptionRequested,
+                infos=infos,
+                on_extracted=self.out_queue.put if self.out_queue is not None else None,
+            )
+            if self.isInterruptionRequested():
+                return
+            self.finished.emit(files)
+
+        except Exception as e:
+            self.error.emit(str(e))
+
+        finally:
+            # Always close the stream, also on error/interrupt.
+            if self.out_queue is not None:
+                self.out_queue.put(None)
+
+
 class ClassificationWorker(QThread):
-    """Stage 1: Extract text + detect doc types for all documents first."""
+    """
+    Stage 1: Extract text + detect doc types for all documents first.
+
+    Files come from a fixed list, or from `source`: a queue filled while the ZIP is
+    still being extracted (None marks the end of the stream).
+    With a ClassificationCache, files whose contents were classified before are
+    neither extracted nor classified again; the cache is saved once at the end.
+    Files are handled in batches of `batch_size` (see classify_documents()).
+    """
 
     progress = pyqtSignal(str)
+    file_done = pyqtSignal(int)  # number of input files handled so far (skipped ones included)
     finished = pyqtSignal(list)  # List[dict]
     error = pyqtSignal(str)
 
-    def __init__(self, file_paths: List[Path]):
+    def __init__(
+        self,
+        file_paths: Optional[List[Path]] = None,
+        *,
+        source: Optional["queue.Queue[Optional[Path]]"] = None,
+        cache: Optional[ClassificationCache] = None,
+        batch_size: int = 32,
+    ):
         super().__init__()
 
-        # Filter out macOS metadata artifacts up-front.
+        # Files that can never yield text (images, archives, ...) are counted, not classified.
+        self.skipped_unsupported = 0
+        # All rejected input files (macOS artifacts too), so file_done can reach the input count.
+        self._rejected = 0
+
+        # Filter out macOS metadata artifacts and unsupported files up-front.
         clean: List[Path] = []
-        for p in file_paths:
+        for p in file_paths or []:
             pp = Path(p)
-            if _is_macos_zip_artifact(pp):
+            if not self._accept(pp):
                 continue
             clean.append(pp)
 
         self.file_paths = clean
+        self.source = source
+        self.cache = cache
+        # Files are extracted/classified per batch: rules load once per batch and
+        # the UI gets one progress update per batch instead of per file.
+        self.batch_size = max(1, int(batch_size))
+        self._hash_pool: Optional[ThreadPoolExecutor] = None
+        # Text extraction (pdfplumber/python-docx, pure Python) runs in worker processes;
+        # started on the first batch with more than one file to extract.
+        self._extract_pool: Optional[ProcessPoolExecutor] = None
+
+    def _accept(self, path: Path) -> bool:
+        if _is_macos_zip_artifact(path):
+            self._rejected += 1
+            return False
+        if not is_supported_document(path):
+            self.skipped_unsupported += 1
+            self._rejected += 1
+            return False
+        return True
+
+    def _iter_batches(self) -> Iterator[List[Path]]:
+        """
+        Yield lists of at most batch_size paths. From a queue, a batch holds whatever
+        has arrived so far, so a slow extractor never delays classification.
+        """
+        if self.source is None:
+            for start in range(0, len(self.file_paths), self.batch_size):
+                if self.isInterruptionRequested():
+                    return
+                yield self.file_paths[start : start + self.batch_size]
+            return
+
+        done = False
+        while not done and not self.isInterruptionRequested():
+            batch: List[Path] = []
+            item = self.source.get()
+            while True:
+                if item is None:
+                    done = True
+                    break
+                p = Path(item)
+                if self._accept(p):
+                    batch.append(p)
+                if len(batch) >= self.batch_size:
+                    break
+                try:
+                    item = self.source.get_nowait()
+                except queue.Empty:
+                    break
+            if batch:
+                yield batch
+
+    def _classify_batch(self, paths: List[Path]) -> List[Optional[Dict]]:
+        """
+        Classify one batch; None for files without text.
+        Cache hits skip extraction; the misses are classified with one classify_documents() call.
+        """
+        results: List[Optional[Dict]] = [None] * len(paths)
+        misses: List[tuple] = []  # (index, path, sha)
+        pending: List[tuple] = []  # (index, path, sha, text)
+
+        # Hash the whole batch up front (hashlib releases the GIL) and look it up in one query.
+        shas: List[Optional[str]] = [None] * len(paths)
+        cached: Dict[str, Dict] = {}
+        if self.cache is not None:
+            if self._hash_pool is not None and len(paths) > 1:
+                shas = list(self._hash_pool.map(_safe_sha256, paths))
+            else:
+                shas = [_safe_sha256(p) for p in paths]
+            cached = self.cache.get_many(sha for sha in shas if sha)
+
+        for idx, file_path in enumerate(paths):
+            try:
+                sha = shas[idx]
+                entry = cached.get(sha) if sha else None
+                if entry is not None and entry.get("filename") == file_path.name:
+                    results[idx] = {
+                        "path": str(file_path),
+                        "filename": file_path.name,
+                        "doc_type": entry.get("doc_type", ""),
+                        "confidence": entry.get("confidence"),
+                        "text": entry.get("text", ""),
+                    }
+                    continue
+
+                misses.append((idx, file_path, sha))
+
+            except Exception as e:
+                self.error.emit(f"Error classifying {file_path.name}: {e}")
+
+        for (idx, file_path, sha), text in zip(misses, self._extract_texts([p for _, p, _ in misses])):
+            if isinstance(text, Exception):
+                self.error.emit(f"Error classifying {file_path.name}: {text}")
+                continue
+            if not text or not text.strip():
+                self.error.emit(f"Warning: No text extracted for {file_path.name} (skipped)")
+                continue
+            pending.append((idx, file_path, sha, text))
+
+        if not pending:
+            return results
+
+        try:
+            doc_types = classify_documents([(p, text) for _, p, _, text in pending])
+        except Exception:
+            # Fall back to per-file classification so one bad file doesn't sink the batch.
+            doc_types = []
+            for _, file_path, _, text in pending:
+                try:
+                    doc_types.append(classify_document(file_path, text))
+                except Exception as e:
+                    self.error.emit(f"Error classifying {file_path.name}: {e}")
+                    doc_types.append(None)
+
+        for (idx, file_path, sha, text), doc_type in zip(pending, doc_types):
+            if doc_type is None:
+                continue
+            if sha and self.cache is not None:
+                self.cache.put(sha, file_path.name, doc_type, text)
+            results[idx] = {
+                "path": str(file_path),
+                "filename": file_path.name,
+                "doc_type": doc_type,
+                "text": text,
+            }
+
+        return results
+
+    def _extract_texts(self, paths: List[Path]) -> List[object]:
+        """
+        extract_text() for each path, in order; a failing file yields its exception.
+        Several files are spread over worker processes (spawned once per run),
+        or over threads when no process pool is available.
+        """
+        if len(paths) > 1 and (os.cpu_count() or 1) > 1 and self._extract_pool is None:
+            self._extract_pool = spawn_process_pool(min(os.cpu_count() or 1, self.batch_size))
+
+        futures = []
+        if len(paths) > 1 and self._extract_pool is not None:
+            try:
+                futures = [self._extract_pool.submit(extract_text, p) for p in paths]
+            except Exception:
+                futures = []
+
+        if len(paths) > 1 and not futures:
+            # No worker processes (single core, or they could not start): still overlap
+            # the file reads with threads. File I/O and pypdfium2's C calls release the GIL,
+            # so one file's disk wait no longer stalls the whole batch.
+            with ThreadPoolExecutor(max_workers=min(8, len(paths))) as pool:
+                futures = [pool.submit(extract_text, p) for p in paths]
+
+        texts: List[object] = []
+        for i, path in enumerate(paths):
+            try:
+                try:
+                    texts.append(futures[i].result() if futures else extract_text(path))
+                except BrokenExecutor:
+                    # Worker process died (or could not start): extract this one here.
+                    texts.append(extract_text(path))
+            except Exception as e:
+                texts.append(e)
+        return texts
 
     def run(self):
         results: List[Dict] = []
         try:
-            total = len(self.file_paths)
+            total = len(self.file_paths) if self.source is None else 0
+            handled = 0
+            if self.cache is not None:
+                self._hash_pool = ThreadPoolExecutor(max_workers=min(8, self.batch_size))
 
-            for i, file_path in enumerate(self.file_paths, start=1):
-                if _is_macos_zip_artifact(file_path):
-                    continue
+            for batch in self._iter_batches():
+                # One progress line per batch keeps the log widget cheap on large archives.
+                end = handled + len(batch)
+                counter = f"({handled + 1}-{end}/{total})" if total else f"({handled + 1}-{end})"
+                self.progress.emit(f"{counter} Detecting type: {batch[0].name} ...")
 
                 try:
-                    self.progress.emit(f"({i}/{total}) Detecting type: {file_path.name}")
-
-                    text = extract_text(file_path)
-                    if not text or not text.strip():
-                        self.error.emit(f"Warning: No text extracted for {file_path.name} (skipped)")
-                        continue
-
-                    doc_type = classify_document(file_path, text)
-                    results.append(
-                        {
-                            "path": str(file_path),
-                            "filename": file_path.name,
-                            "doc_type": doc_type,
-                            "text": text,
-                        }
-                    )
+                    results.extend(item for item in self._classify_batch(batch) if item is not None)
+                finally:
+                    handled = end
+                    self.file_done.emit(handled + self._rejected)
 
-                except Exception as e:
-                    self.error.emit(f"Error classifying {file_path.name}: {e}")
+            # Skipped files after the last batch (or no batch at all) still count.
+            self.file_done.emit(handled + self._rejected)
+
+            if self.skipped_unsupported:
+                self.progress.emit(f"Skipped {self.skipped_unsupported} file(s) of an unsupported type")
+
+            if self.cache is not None:
+                self.cache.save()
 
             self.finished.emit(results)
 
         except Exception as e:
             self.error.emit(f"Classification failed: {e}")
 
+        finally:
+            if self._hash_pool is not None:
+                self._hash_pool.shutdown(wait=False)
+                self._hash_pool = None
+            if self._extract_pool is not None:
+                self._extract_pool.shutdown(wait=False, cancel_futures=True)
+                self._extract_pool = None
+
 
 class SummarizationWorker(QThread):
-    """Stage 2: Summarize one document (doc_type/text can be precomputed)."""
+    """
+    Stage 2: Summarize documents (doc_type/text can be precomputed).
+
+    One long-lived thread per window: jobs are pushed with submit() and processed
+    in order, so the model check and the loaded LLM are reused across documents.
+    Several jobs may be queued at once; each emits `started(job_id)` when the worker
+    picks it up and ends with exactly one `finished` (result["job_id"]) or
+    `failed(job_id, message)` emit. `error` is reserved for
+    failures of the worker itself (model preparation), after which it exits.
+    Call stop() to let the thread exit after the current job.
+    """
 
     progress = pyqtSignal(str)
+    started = pyqtSignal(str)  # job_id
     finished = pyqtSignal(dict)
+    failed = pyqtSignal(str, str)  # job_id, message
     error = pyqtSignal(str)
 
     def __init__(
         self,
-        file_path: Path,
         output_dir: Path,
         extracted_dir: Path,
-        *,
-        doc_type: Optional[str] = None,
-        text: Optional[str] = None,
+        jobs: Optional["queue.Queue[Optional[Dict]]"] = None,
+        cache: Optional[ClassificationCache] = None,
     ):
         super().__init__()
-        self.file_path = Path(file_path)
         self.output_dir = Path(output_dir)
         self.extracted_dir = Path(extracted_dir)
-        self.precomputed_doc_type = doc_type
-        self.precomputed_text = text
+        self.jobs: "queue.Queue[Optional[Dict]]" = jobs if jobs is not None else queue.Queue()
+        # Texts of files classified before are reused instead of extracted again.
+        self.cache = cache
+        self._job_id = ""  # job being processed (worker thread only)
 
-    def _ensure_extracted_copy(self) -> Path:
-        """Copy original file to extracted_dir unless it's already there."""
+    def submit(
+        self,
+        file_path: Path,
+        *,
+        doc_type: Optional[str] = None,
+        text: Optional[str] = None,
+        text_future: Optional[Future] = None,
+        job_id: str = "",
+    ) -> None:
+        """
+        Queue one document. `text_future` may carry a prefetched extract_text() result;
+        it is awaited on this worker thread, never on the UI thread.
+        `job_id` is echoed back in `started`/`finished`/`failed` (e.g. the document id).
+        """
+        self.jobs.put(
+            {
+                "file_path": Path(file_path),
+                "doc_type": doc_type,
+                "text": text,
+                "text_future": text_future,
+                "job_id": job_id,
+            }
+        )
+
+    def stop(self) -> None:
+        # Sentinel: run() exits once it reaches it.
+        self.jobs.put(None)
+
+    def _ensure_extracted_copy(self, file_path: Path) -> Path:
+        """Link (or copy) original file to extracted_dir unless it's already there."""
         self.extracted_dir.mkdir(parents=True, exist_ok=True)
-        target = self.extracted_dir / self.file_path.name
+        target = self.extracted_dir / file_path.name
 
         try:
-            if self.file_path.resolve().parent == self.extracted_dir.resolve():
-                return self.file_path
+            if file_path.resolve().parent == self.extracted_dir.resolve():
+                return file_path
         except Exception:
             pass
 
         try:
-            shutil.copy2(self.file_path, target)
+            # Same filesystem: a hardlink is just a directory entry, no byte copy.
+            # Cross-device (EXDEV) or an existing target falls back to copy2.
+            try:
+                os.link(file_path, target)
+            except OSError:
+                shutil.copy2(file_path, target)
             return target
         except Exception:
-            return self.file_path
+            return file_path
 
     def run(self):
         try:
-            filename = self.file_path.name
-
-            # Never process macOS metadata files.
-            if _is_macos_zip_artifact(self.file_path):
-                self.progress.emit(f"Skipping macOS metadata file: {filename}")
-                return
-
-            # 0) Ensure model first (download on first run).
+            # 0) Ensure model first (download on first run), once for all jobs.
             # IMPORTANT: "Starting summarization..." should appear only after this.
-            with _LLM_JOB_LOCK:
+            with _MODEL_READY_LOCK:
                 already_present = _is_model_present()
 
                 if not already_present:
@@ -174,41 +499,69 @@ class SummarizationWorker(QThread):
             # 1) Now we can safely announce summarization start (model is ready).
             self.progress.emit("Starting summarization...")
 
+        except Exception as e:
+            self.error.emit(f"Error preparing LLM model: {e}")
+            return
+
+        while not self.isInterruptionRequested():
+            job = self.jobs.get()
+            if job is None:
+                break
+            self._job_id = job.get("job_id") or ""
+            self.started.emit(self._job_id)
+            text = job.get("text")
+            text_future = job.get("text_future")
+            if text is None and text_future is not None:
+                try:
+                    text = text_future.result()
+                except Exception:
+                    # Prefetch failed; _process() extracts again and reports errors.
+                    text = None
+            self._process(job["file_path"], job.get("doc_type"), text)
+
+    def _process(self, file_path: Path, precomputed_doc_type: Optional[str], precomputed_text: Optional[str]) -> None:
+        try:
+            filename = file_path.name
+
+            # Never process macOS metadata files.
+            if _is_macos_zip_artifact(file_path):
+                self.failed.emit(self._job_id, f"Skipping macOS metadata file: {filename}")
+                return
+
             self.progress.emit(f"Processing: {filename}")
 
             self.output_dir.mkdir(parents=True, exist_ok=True)
 
-            extracted_path = self._ensure_extracted_copy()
+            extracted_path = self._ensure_extracted_copy(file_path)
 
             # 2) Get text
-            text = self.precomputed_text
+            text = precomputed_text
             if text is None:
-                text = extract_text(extracted_path)
+                text = extract_text_cached(extracted_path, self.cache)
             if not text or not text.strip():
-                self.error.emit(f"Warning: No text extracted in {filename}")
+                self.failed.emit(self._job_id, f"Warning: No text extracted in {filename}")
                 return
 
             # 3) Get doc_type
-            doc_type = self.precomputed_doc_type
+            doc_type = precomputed_doc_type
             if not doc_type:
                 doc_type = classify_document(extracted_path, text)
             self.progress.emit(f"Document type: {doc_type}")
 
-            # 4) Run summarization (also keep it serialized if your LLM backend isn't thread-safe)
-            with _LLM_JOB_LOCK:
-                def progress_cb(message: str):
-                    self.progress.emit(message)
+            # 4) Run summarization (the summarizer serializes the LLM calls themselves)
+            def progress_cb(message: str):
+                self.progress.emit(message)
 
-                summary = summarize_document(
-                    doc_type=doc_type,
-                    text=text,
-                    progress_callback=progress_cb,
-                )
+            summary = summarize_document(
+                doc_type=doc_type,
+                text=text,
+                progress_callback=progress_cb,
+            )
 
-            # 5) Save TXT
+            # 5) Save TXT (temp file + rename, like the JSON below)
             stem = extracted_path.stem
             txt_path = self.output_dir / f"{stem}_summary.txt"
-            txt_path.write_text(summary, encoding="utf-8")
+            _write_atomic(txt_path, summary.encode("utf-8"))
 
             # 6) Save JSON with metadata
             json_path = self.output_dir / f"{stem}_summary.json"
@@ -219,10 +572,7 @@ class SummarizationWorker(QThread):
                 "summary": summary,
                 "meta": extract_basic_meta(text),
             }
-            json_path.write_text(
-                json.dumps(json_data, indent=2, ensure_ascii=False),
-                encoding="utf-8",
-            )
+            _write_atomic(json_path, dump_summary_json(json_data, compact=True))
 
             # 7) Done
             self.finished.emit(
@@ -231,8 +581,9 @@ class SummarizationWorker(QThread):
                     "doc_type": doc_type,
                     "summary": summary,
                     "path": txt_path,
+                    "job_id": self._job_id,
                 }
             )
 
         except Exception as e:
-            self.error.emit(f"Error processing {self.file_path.name}: {e}")
+            self.failed.emit(self._job_id, f"Error processing {file_path.name}: {e}")
@@ -5,7 +5,53 @@ from typing import Optional
 import re
 
 import docx
-import pdfplumber
+
+try:
+    # pypdfium2 (PDFium, C++): plain-text extraction much faster than pdfplumber's
+    # pure-Python layout analysis; pdfplumber (imported when needed) is the fallback.
+    import pypdfium2 as _pdfium
+except ImportError:
+    _pdfium = None
+
+
+# Identifies the text extract_text() produces; bump it whenever extraction or
+# sanitizing changes, so texts cached under an older version are not reused.
+EXTRACTOR_VERSION = "2/" + ("pdfium" if _pdfium is not None else "pdfplumber")
+
+# Extensions extract_text() can read.
+SUPPORTED_SUFFIXES = {".docx", ".pdf", ".txt", ".md"}
+
+# Magic numbers for files without an extension.
+_MAGIC_SUFFIXES = (
+    (b"%PDF-", ".pdf"),
+    (b"PK\x03\x04", ".docx"),
+)
+
+
+def _sniff_suffix(path: Path) -> str:
+    """
+    Effective suffix: the extension, or for extensionless files a guess from the first bytes.
+    """
+    suffix = path.suffix.lower()
+    if suffix:
+        return suffix
+    try:
+        with open(path, "rb") as f:
+            head = f.read(16)
+    except OSError:
+        return ""
+    for magic, sniffed in _MAGIC_SUFFIXES:
+        if head.startswith(magic):
+            return sniffed
+    return ""
+
+
+def is_supported_document(path: Path) -> bool:
+    """
+    Cheap pre-check (extension, or magic bytes for extensionless files) whether
+    extract_text() can read this file at all. Images, archives etc. return False.
+    """
+    return _sniff_suffix(path) in SUPPORTED_SUFFIXES
 
 
 def extract_text(path: Path) -> Optional[str]:
@@ -13,7 +59,7 @@ def extract_text(path: Path) -> Optional[str]:
     Read text content from .docx, .pdf, or .txt file.
     Returns None if file format is unsupported.
     """
-    suffix = path.suffix.lower()
+    suffix = _sniff_suffix(path)
     if suffix == ".docx":
         text = _extract_docx(path)
     elif suffix == ".pdf":
@@ -27,11 +73,47 @@ def extract_text(path: Path) -> Optional[str]:
 
 def _extract_docx(path: Path) -> str:
     doc = docx.Document(path)
-    paragraphs = [p.text for p in doc.paragraphs if p.text.strip()]
-    return "\n".join(paragraphs)
+    # Paragraph.text rebuilds the string from its runs on every access: read it once.
+    texts = (p.text for p in doc.paragraphs)
+    return "\n".join(t for t in texts if t.strip())
 
 
 def _extract_pdf(path: Path) -> str:
+    if _pdfium is not None:
+        try:
+            text = _extract_pdf_pdfium(path)
+        except Exception:
+            text = ""
+        if text.strip():
+            return text
+    # No pypdfium2, a file PDFium cannot read, or no text layer found by it
+    return _extract_pdf_pdfplumber(path)
+
+
+def _extract_pdf_pdfium(path: Path) -> str:
+    text_parts = []
+    pdf = _pdfium.PdfDocument(str(path))
+    try:
+        for i in range(len(pdf)):
+            page = pdf[i]
+            try:
+                textpage = page.get_textpage()
+                try:
+                    page_text = textpage.get_text_range()
+                finally:
+                    textpage.close()
+            finally:
+                page.close()
+            if page_text:
+                text_parts.append(page_text)
+    finally:
+        pdf.close()
+    return "\n".join(text_parts)
+
+
+def _extract_pdf_pdfplumber(path: Path) -> str:
+    import pdfplumber
+
     text_parts = []
     with pdfplumber.open(path) as pdf:
         for page in pdf.pages:
@@ -41,9 +123,16 @@ def _extract_pdf(path: Path) -> str:
     return "\n".join(text_parts)
 
 
+# _sanitize(): blank-line runs and "Pagina X van Y" in one pass (same result as
+# collapsing the newlines first and then removing the page markers).
+_RE_SANITIZE = re.compile(r"(?P<nl>\n{3,})|Pagina\s+\d+\s+van\s+\d+\s*", re.I)
+
+
+def _sanitize_sub(m: "re.Match") -> str:
+    return "\n\n" if m.lastgroup == "nl" else ""
+
+
 def _sanitize(text: str) -> str:
-    t = text or ""
-    t = re.sub(r"\r\n", "\n", t)
-    t = re.sub(r"\n{3,}", "\n\n", t)
-    t = re.sub(r"Pagina\s+\d+\s+van\s+\d+\s*", "", t, flags=re.I)
+    t = (text or "").replace("\r\n", "\n")
+    t = _RE_SANITIZE.sub(_sanitize_sub, t)
     return t.strip()
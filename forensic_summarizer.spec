@@ -32,15 +32,20 @@ datas = [
 
 # ctransformers data files (vocab, configs, etc.)
 datas += collect_data_files("ctransformers")
+# llama-cpp-python (preferred backend when installed): Metal shaders etc.
+datas += collect_data_files("llama_cpp")
 
 # ---------- native libs ----------
 # This collects libctransformers.dylib and other native libs
 binaries = collect_dynamic_libs("ctransformers")
+# libllama / libggml*.dylib
+binaries += collect_dynamic_libs("llama_cpp")
 
 # ---------- hidden imports ----------
 hiddenimports = (
     collect_submodules("backend")
     + collect_submodules("ctransformers")
+    + collect_submodules("llama_cpp")
 )
 
 a = Analysis(
@@ -1,19 +1,34 @@
 # main.py (оновлений під повний UI flow)
 
+import multiprocessing
 import sys
 from PyQt5.QtWidgets import QApplication
 
+from backend.classification_cache import remove_legacy_cache
+from backend.config import EXTRACTED_DIR
+from backend.state import default_cases_root, sweep_discarded_dirs
 from UI.login_window import LoginWindow
+from UI.ui_theme import apply_app_theme
 
 # Якщо в майбутньому буде передача стану між вікнами,
 # можна буде створити клас AppController або ContextManager
 
 def main():
     app = QApplication(sys.argv)
+    # Theme is applied once up front; windows then only get polished on first show.
+    apply_app_theme(app)
+    # Document texts no longer live in an app-wide cache (now per case folder).
+    remove_legacy_cache()
+    # Finish deletions (cases, old extraction folders) interrupted by a previous quit.
+    sweep_discarded_dirs(default_cases_root())
+    sweep_discarded_dirs(EXTRACTED_DIR.parent)
     window = LoginWindow()
     window.show()
     sys.exit(app.exec_())
 
 
 if __name__ == "__main__":
+    # Needed for the spawned extraction workers (summarizer_worker._extract_texts,
+    # process_zip._prepare_pool) in the PyInstaller build.
+    multiprocessing.freeze_support()
     main()